@@ -0,0 +1,271 @@
+"""Post-processing benchmark for social_media_osint.py
+
+Generates synthetic {username}_sherlock.json, tweets NDJSON,
+Social-Analyzer output and an Instaloader post directory at each requested
+size, then times and memory-profiles generate_report, generate_html_report
+and generate_visualizations. Each runs in a fresh interpreter, so peak RSS
+is not shared between measurements, and on a fresh copy of the data, so no
+target reuses another's stores, indexes, charts or fingerprints. With
+--pipeline the whole CLI is also run against fake
+sherlock/social-analyzer/twint/instaloader executables that replay the
+synthetic artifacts, writing nothing outside the benchmark's directory.
+
+Results are printed (and optionally written with --output) as JSON so runs
+can be compared across versions.
+
+Usage: python benchmarks/bench_reports.py [--sizes 100,10000,1000000] [--pipeline]
+                                          [--output bench.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+USERNAME = "benchuser"
+TARGETS = ["generate_report", "generate_html_report", "generate_visualizations"]
+
+def write_sherlock(path, size, rng):
+    """Write a Sherlock result with ``size`` sites, streaming it to disk"""
+    with open(path, "w") as f:
+        f.write("{")
+        for i in range(size):
+            status = "Claimed" if rng.random() < 0.2 else "Available"
+            site = {"url_main": f"https://site{i}.example", "url_user": f"https://site{i}.example/{USERNAME}",
+                    "status": status, "http_status": 200 if status == "Claimed" else 404,
+                    "response_time_s": round(rng.random(), 3), "url": f"https://site{i}.example/{USERNAME}"}
+            f.write(("," if i else "") + json.dumps(f"Site{i}") + ":" + json.dumps(site))
+        f.write("}")
+
+def write_tweets(path, size, rng):
+    """Write ``size`` Twint-style tweets, one JSON object per line"""
+    start = datetime(2015, 1, 1)
+    with open(path, "w") as f:
+        for i in range(size):
+            created = start + timedelta(seconds=rng.randrange(10 * 365 * 86400))
+            tweet = {
+                "id": 10 ** 18 + i, "conversation_id": str(10 ** 18 + i),
+                "date": created.strftime("%Y-%m-%d"), "time": created.strftime("%H:%M:%S"),
+                "timezone": "+0000", "user_id": 42, "username": USERNAME, "name": "Bench User",
+                "tweet": "synthetic tweet " * rng.randint(1, 12), "language": "en",
+                "likes_count": rng.randint(0, 500), "retweets_count": rng.randint(0, 100),
+                "replies_count": rng.randint(0, 20), "hashtags": [], "urls": [], "photos": []
+            }
+            f.write(json.dumps(tweet) + "\n")
+
+def write_social_analyzer(path, size, rng):
+    """Write a Social-Analyzer result with ``size`` detected profiles"""
+    detected = [{"link": f"https://site{i}.example/{USERNAME}", "rate": f"{rng.randint(50, 100)}%",
+                 "status": "good", "title": f"Profile {i}", "language": "en"} for i in range(size)]
+    with open(path, "w") as f:
+        json.dump({"detected": detected, "unknown": [], "failed": []}, f)
+
+def write_instagram(directory, size, rng):
+    """Write ``size`` Instaloader-style post files and a profile file"""
+    directory.mkdir(parents=True, exist_ok=True)
+    start = datetime(2015, 1, 1)
+    locations = [None, None, {"id": "1", "name": "Berlin"}, {"id": "2", "name": "Lisbon"}]
+    tags = ["travel", "food", "sunset", "code", "coffee", "music"]
+    for i in range(size):
+        taken = start + timedelta(seconds=rng.randrange(10 * 365 * 86400))
+        caption = "post " + " ".join(f"#{tag}" for tag in rng.sample(tags, rng.randint(0, 3)))
+        node = {
+            "__typename": "GraphImage", "shortcode": f"C{i:08d}", "is_video": rng.random() < 0.1,
+            "taken_at_timestamp": int(taken.timestamp()),
+            "edge_media_preview_like": {"count": rng.randint(0, 1000)},
+            "edge_media_to_comment": {"count": rng.randint(0, 50)},
+            "edge_media_to_caption": {"edges": [{"node": {"text": caption}}]},
+            "location": rng.choice(locations)
+        }
+        name = taken.strftime("%Y-%m-%d_%H-%M-%S_UTC") + f"_{i}.json"
+        with open(directory / name, "w") as f:
+            json.dump({"node": node, "instaloader": {"node_type": "Post"}}, f)
+    profile = {"username": USERNAME, "full_name": "Bench User", "biography": "synthetic", "id": "42",
+               "edge_followed_by": {"count": 1234}, "edge_follow": {"count": 56},
+               "edge_owner_to_timeline_media": {"count": size}}
+    with open(directory / f"{USERNAME}_42.json", "w") as f:
+        json.dump({"node": profile, "instaloader": {"node_type": "Profile"}}, f)
+
+def generate_dataset(directory, size, seed=1):
+    """Create all synthetic artifacts for one size in ``directory``"""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    write_sherlock(directory / f"{USERNAME}_sherlock.json", size, rng)
+    write_tweets(directory / f"{USERNAME}_twitter_tweets.json", size, rng)
+    write_social_analyzer(directory / f"{USERNAME}_social_analyzer.json", size, rng)
+    (directory / f"{USERNAME}_sherlock.txt").write_text("")
+    write_instagram(directory / f"{USERNAME}_instagram", size, rng)
+
+FAKE_SHERLOCK = """import shutil, sys, os
+args = sys.argv
+shutil.copy(os.path.join(os.environ["BENCH_DATA_DIR"], "{u}_sherlock.json"), args[args.index("--json") + 1])
+open(args[args.index("--output") + 1], "w").close()
+"""
+
+FAKE_SOCIAL_ANALYZER = """import shutil, sys, os
+with open(os.path.join(os.environ["BENCH_DATA_DIR"], "{u}_social_analyzer.json"), "rb") as f:
+    shutil.copyfileobj(f, sys.stdout.buffer)
+"""
+
+FAKE_TWINT = """#!{python}
+import shutil, sys, os
+args = sys.argv
+output = args[args.index("-o") + 1]
+if "--followers" in args:
+    open(output, "w").write('{{"username": "follower"}}\\n')
+elif "--limit" in args:
+    shutil.copy(os.path.join(os.environ["BENCH_DATA_DIR"], "{u}_twitter_tweets.json"), output)
+else:
+    open(output, "w").write('{{"username": "{u}"}}\\n')
+"""
+
+FAKE_INSTALOADER = """#!{python}
+import os, shutil, sys
+args = sys.argv
+directory = args[args.index("--dirname-pattern") + 1]
+shutil.copytree(os.path.join(os.environ["BENCH_DATA_DIR"], "{u}_instagram"), directory, dirs_exist_ok=True)
+"""
+
+def install_fake_tools(directory):
+    """Write fake collector executables and return (tools_dir, bin_dir)"""
+    bin_dir = directory / "bin"
+    (directory / "sherlock").mkdir(parents=True, exist_ok=True)
+    (directory / "social-analyzer").mkdir(parents=True, exist_ok=True)
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    (directory / "sherlock" / "sherlock.py").write_text(FAKE_SHERLOCK.format(u=USERNAME))
+    (directory / "social-analyzer" / "app.py").write_text(FAKE_SOCIAL_ANALYZER.format(u=USERNAME))
+    for name, template in (("twint", FAKE_TWINT), ("instaloader", FAKE_INSTALOADER)):
+        path = bin_dir / name
+        path.write_text(template.format(python=sys.executable, u=USERNAME))
+        path.chmod(0o755)
+    # The fake sherlock.py is started as "python3"
+    python3 = bin_dir / "python3"
+    if not python3.exists():
+        python3.symlink_to(sys.executable)
+    return directory, bin_dir
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_child(target, data_dir, tools_dir):
+    """Measure one target in this (fresh) interpreter and print the result"""
+    sys.path.insert(0, str(REPO_DIR))
+    import social_media_osint as osint
+
+    if target == "pipeline":
+        osint.SHERLOCK_PATH = Path(tools_dir) / "sherlock"
+        osint.SOCIAL_ANALYZER_PATH = Path(tools_dir) / "social-analyzer"
+        osint.RESULTS_DIR = Path(data_dir) / "results"
+        osint.CACHE_DIR = osint.RESULTS_DIR / ".cache"
+        results_dir = osint.RESULTS_DIR
+        # Name every shared file explicitly so nothing lands in the checkout's results/.
+        # The fake tools never throttle, so do not let the rate limiter pace them
+        sys.argv = ["social_media_osint.py", USERNAME, "--all", "--engine", "sherlock", "--no-cache",
+                    "--no-index", "--no-banner", "--output-dir", str(Path(data_dir) / "pipeline"),
+                    "--metrics-log", str(results_dir / "metrics.jsonl"),
+                    "--metrics-textfile", str(results_dir / "osint_metrics.prom"),
+                    "--twitter-archive", str(results_dir / "twitter_archive.db"),
+                    *(f"--rate-limit={backend}=1000:1000" for backend in osint.RATE_LIMITS)]
+        call = osint.main
+    else:
+        if target != "generate_report":
+            # Keep library imports out of the measurement of the function itself
+            import pandas, matplotlib, seaborn
+        func = getattr(osint, target)
+        call = lambda: func(USERNAME, data_dir)
+
+    baseline = peak_rss_mb()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            call()
+        finally:
+            sys.stdout = stdout
+    print(json.dumps({
+        "wall_seconds": round(time.perf_counter() - wall, 4),
+        "cpu_seconds": round(time.process_time() - cpu, 4),
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": peak_rss_mb()
+    }))
+
+def measure(target, data_dir, tools_dir=None, bin_dir=None):
+    env = dict(os.environ, BENCH_DATA_DIR=str(data_dir))
+    if bin_dir is not None:
+        env["PATH"] = f"{bin_dir}{os.pathsep}{env.get('PATH', '')}"
+    output = subprocess.run([sys.executable, __file__, "--child", target, str(data_dir), str(tools_dir)],
+                            env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report generation on synthetic data")
+    parser.add_argument("--sizes", default="100,1000,10000",
+                        help="Comma-separated record counts (default: 100,1000,10000)")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated functions to measure")
+    parser.add_argument("--pipeline", action="store_true", help="Also run the full CLI against fake tools")
+    parser.add_argument("--work-dir", help="Keep generated data here instead of a temporary directory")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--child", nargs=3, metavar=("TARGET", "DATA_DIR", "TOOLS_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="osint-bench-"))
+    targets = [target for target in args.targets.split(",") if target]
+    tools_dir = bin_dir = None
+    if args.pipeline:
+        tools_dir, bin_dir = install_fake_tools(work_dir / "tools")
+        targets.append("pipeline")
+
+    revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    report = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "revision": revision or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": []
+    }
+
+    try:
+        for size in (int(size) for size in args.sizes.split(",") if size):
+            size_dir = work_dir / f"size_{size}"
+            source_dir = size_dir / "dataset"
+            start = time.perf_counter()
+            generate_dataset(source_dir, size)
+            print(f"Generated {size} records in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            for target in targets:
+                data_dir = size_dir / target
+                shutil.rmtree(data_dir, ignore_errors=True)
+                shutil.copytree(source_dir, data_dir)
+                result = measure(target, data_dir, tools_dir, bin_dir)
+                result.update({"target": target, "size": size})
+                report["results"].append(result)
+                print(f"  {target:<26} {result['wall_seconds']:>9.3f}s  {result['peak_rss_mb']:>8.1f} MB",
+                      file=sys.stderr)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Startup-time benchmark for social_media_osint.py
+
+Imports the module in fresh interpreters and reports the median wall time.
+Exits non-zero if the median exceeds --max-seconds or if importing the
+module pulls in any of the heavy optional libraries, so it can be run in CI
+to keep startup from regressing.
+
+Usage: python benchmarks/bench_startup.py [--runs 10] [--max-seconds 0.5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["pandas", "matplotlib", "seaborn", "pyfiglet", "requests"]
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import social_media_osint
+elapsed = time.perf_counter() - start
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+def measure(runs):
+    """Import the module ``runs`` times in fresh interpreters"""
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_DIR, check=True,
+                                stdout=subprocess.PIPE, text=True).stdout.split()
+        timings.append(float(output[0]))
+        if len(output) > 1:
+            loaded.update(output[1].split(","))
+    return timings, sorted(loaded)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of social_media_osint")
+    parser.add_argument("--runs", type=int, default=10, help="Number of fresh interpreters to start")
+    parser.add_argument("--max-seconds", type=float, default=0.5,
+                        help="Fail if the median import time is above this")
+    args = parser.parse_args()
+
+    timings, loaded = measure(args.runs)
+    result = {
+        "runs": args.runs,
+        "median_seconds": round(statistics.median(timings), 4),
+        "max_seconds": round(max(timings), 4),
+        "heavy_modules_loaded": loaded,
+    }
+    print(json.dumps(result, indent=4))
+
+    if loaded or result["median_seconds"] > args.max_seconds:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
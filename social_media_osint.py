@@ -4,16 +4,39 @@ import argparse
 import subprocess
 import json
 import time
+import hashlib
+import math
+import shutil
+import tempfile
+import signal
+import asyncio
+import ssl
+import functools
 import re
 import csv
-import requests
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import glob
+import threading
+import itertools
+import contextlib
+import fcntl
+import resource
+import cProfile
+import pstats
+import sqlite3
+import socket
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import multiprocessing
 from datetime import datetime
+from functools import cached_property
+from html import escape
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import urlsplit, urljoin, quote
 from colorama import Fore, Style, init
-import pyfiglet
+
+# pandas, matplotlib, seaborn and pyfiglet take over a second to import, so
+# they are imported inside the functions that use them
 
 # Initialize colorama
 init(autoreset=True) 
@@ -23,9 +46,90 @@ SCRIPT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 RESULTS_DIR = SCRIPT_DIR / "results"
 SHERLOCK_PATH = SCRIPT_DIR / "sherlock"
 SOCIAL_ANALYZER_PATH = SCRIPT_DIR / "social-analyzer"
+CACHE_DIR = RESULTS_DIR / ".cache"
+
+# Wall-clock deadline in seconds for each collector, see --stage-timeout
+STAGE_TIMEOUTS = {
+    "sherlock": 900,
+    "social_analyzer": 900,
+    "twint": 600,
+    "instaloader": 1800
+}
+
+# Built-in username presence checker, see --engine and --sites. A
+# sites_file of None means the manifest shipped with Sherlock is used.
+PRESENCE_OPTIONS = {
+    "engine": "native",
+    "sites_file": None,
+    "timeout": 10,
+    "max_connections": 50,
+    "per_host": 4
+}
+# A presence check with a larger share of failed probes counts as failed
+PRESENCE_MAX_ERROR_SHARE = 0.5
+SITE_MANIFEST_CANDIDATES = [
+    SHERLOCK_PATH / "sherlock" / "resources" / "data.json",
+    SHERLOCK_PATH / "sherlock_project" / "resources" / "data.json",
+    SHERLOCK_PATH / "resources" / "data.json"
+]
+PRESENCE_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0"
+
+# Incremental Twitter collection, see --incremental. The archive (a
+# TweetStore, RESULTS_DIR/twitter_archive.db by default) keeps every tweet
+# and the follower set of each watched user between runs.
+TWINT_OPTIONS = {
+    "incremental": False,
+    "archive": None,
+    # The archive is on a filesystem shared by several nodes (worker mode)
+    "shared_archive": False,
+    "followers_limit": 100,
+    "tweets_limit": 100
+}
+
+# How often a running command reports progress, in seconds
+PROGRESS_INTERVAL = 30
+
+# Sustained requests per second and burst size of each backend, shared by
+# every collector in the process, see --rate-limit. "presence_host" applies
+# to each host the built-in presence engine talks to.
+RATE_LIMITS = {
+    "twitter": {"rate": 0.2, "burst": 2},
+    "instagram": {"rate": 0.05, "burst": 1},
+    "sherlock": {"rate": 1.0, "burst": 4},
+    "social_analyzer": {"rate": 1.0, "burst": 4},
+    "presence_host": {"rate": 5.0, "burst": 10}
+}
+RATE_LIMITERS = {}
+RATE_LIMITERS_LOCK = threading.Lock()
+
+# What the collectors print to stderr when a service throttles them. Only
+# whole messages are matched: stdout has progress counters such as [429/512]
+THROTTLE_PATTERN = re.compile(r"HTTP error code 429|too many requests|too many queries|"
+                              r"please wait a few minutes|rate limit exceeded", re.I)
+
+# Set by main() unless --no-cache is given
+RESULT_CACHE = None
+
+# Process pool for chart rendering in batch mode, set by main()
+RENDER_POOL = None
+
+# Cross-run index of findings in RESULTS_DIR, set by main() unless --no-index
+RUN_INDEX = None
+INDEX_NAME = "index.db"
+
+# Per-stage metrics sink, set by main(). STAGE_CONTEXT holds the metrics of
+# the stage running on the current thread so run_command can add the
+# resource usage of the tools it starts.
+METRICS = None
+STAGE_CONTEXT = threading.local()
+
+# Reset the RSS high-water mark for each stage (--stage-peak-rss), see instrument()
+STAGE_PEAK_RSS = False
 
 def print_banner():
     """Print a fancy banner"""
+    import pyfiglet
+    
     banner = pyfiglet.figlet_format("Social Media OSINT", font="slant")
     print(f"{Fore.CYAN}{banner}")
     print(f"{Fore.GREEN}A comprehensive OSINT tool for gathering information about social media accounts")
@@ -46,37 +150,1032 @@ def print_status(message, status="info"):
 def ensure_dir(directory):
     """Ensure a directory exists"""
     if not os.path.exists(directory):
-        os.makedirs(directory)
+        os.makedirs(directory, exist_ok=True)
         print_status(f"Created directory: {directory}")
 
-def run_command(command, shell=False):
-    """Run a shell command and return the output"""
+def stop_process_group(process, grace=5):
+    """Terminate a command started by run_command and everything it spawned"""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+def read_tail(handle, size=4096):
+    """Return the last ``size`` bytes of an open binary file as text"""
+    handle.flush()
+    end = handle.seek(0, os.SEEK_END)
+    handle.seek(max(0, end - size))
+    return handle.read().decode("utf-8", errors="replace")
+
+def run_command(command, shell=False, cwd=None, timeout=None, stdout_file=None, stderr_file=None,
+                label=None):
+    """Run a shell command and return the output
+
+    stdout and stderr go straight to files while the command runs instead of
+    being held in memory. When ``stdout_file`` is given its path is returned,
+    otherwise the output is read back from a temporary file. Returns None if
+    the command fails or runs longer than ``timeout`` seconds, in which case
+    its whole process group is killed.
+
+    The command runs in ``cwd`` instead of changing the process-wide working
+    directory, so several tools can run at the same time.
+    """
+    name = label or os.path.basename(command.split()[0] if shell else command[0])
+    out = open(stdout_file, "w+b") if stdout_file else tempfile.TemporaryFile()
+    err = open(stderr_file, "w+b") if stderr_file else tempfile.TemporaryFile()
+    try:
+        try:
+            process = subprocess.Popen(command, shell=shell, cwd=cwd, stdout=out, stderr=err,
+                                       start_new_session=True)
+        except OSError as e:
+            print_status(f"Command failed: {e}", "error")
+            return None
+        
+        start = time.time()
+        last_progress = start
+        while True:
+            # wait4 reaps the child and returns its own resource usage
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                process.returncode = os.waitstatus_to_exitcode(status)
+                record_child_usage(process.returncode, usage)
+                break
+            now = time.time()
+            elapsed = int(now - start)
+            if timeout is not None and now - start >= timeout:
+                stop_process_group(process)
+                record_child_usage(process.returncode)
+                print_status(f"{name} timed out after {elapsed}s and was killed", "error")
+                return None
+            if now - last_progress >= PROGRESS_INTERVAL:
+                last_progress = now
+                written = os.fstat(out.fileno()).st_size
+                print_status(f"{name} still running after {elapsed}s, {written} bytes of output so far")
+            time.sleep(0.05)
+        
+        if process.returncode != 0:
+            print_status(f"Command failed: {label or command} returned non-zero exit status {process.returncode}",
+                         "error")
+            print_status(f"Error output: {read_tail(err)}", "error")
+            return None
+        
+        if stdout_file:
+            return stdout_file
+        out.seek(0)
+        return out.read().decode("utf-8", errors="replace")
+    finally:
+        out.close()
+        err.close()
+
+def stage_log(output_dir, name):
+    """Path of a log file for a collector under the search directory's logs/"""
+    log_dir = os.path.join(output_dir, "logs")
+    ensure_dir(log_dir)
+    return os.path.join(log_dir, f"{name}.log")
+
+class RateLimiter:
+    """Token bucket with adaptive backoff for one backend
+
+    Callers take a token before each request (or tool run), waiting when
+    the bucket is empty. When a backend reports throttling the rate is
+    halved and new work is held back for an exponentially growing backoff
+    (or the server's Retry-After); every success recovers a tenth of the
+    configured rate.
+    """
+    
+    def __init__(self, rate, burst=1, initial_backoff=5.0, max_backoff=600.0):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = rate / 16
+        self.burst = burst
+        self.tokens = float(burst)
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff = 0.0
+        self.blocked_until = 0.0
+        self.throttles = 0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, cost=1):
+        """Take ``cost`` tokens and return how many seconds to wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= cost
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+    
+    def acquire(self, cost=1):
+        time.sleep(self.reserve(cost))
+    
+    async def acquire_async(self, cost=1):
+        await asyncio.sleep(self.reserve(cost))
+    
+    def throttled(self, retry_after=None):
+        """Back off after the backend throttled us, returning the delay"""
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.backoff = min(self.max_backoff, self.backoff * 2 or self.initial_backoff)
+            delay = self.backoff if retry_after is None else min(self.max_backoff, retry_after)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            # Do not let tokens saved up during the backoff go out in one burst
+            self.tokens = min(self.tokens, 0.0)
+            return delay
+    
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+            self.backoff = 0.0
+
+def rate_limiter(backend):
+    """Shared RateLimiter of a backend, created from RATE_LIMITS on first use
+
+    Backends named ``presence_host:<host>`` use the "presence_host" limits.
+    """
+    with RATE_LIMITERS_LOCK:
+        limiter = RATE_LIMITERS.get(backend)
+        if limiter is None:
+            limits = RATE_LIMITS[backend.split(":", 1)[0]]
+            limiter = RATE_LIMITERS[backend] = RateLimiter(limits["rate"], limits["burst"])
+        return limiter
+
+def reports_throttling(paths, size=65536):
+    """True if the tail of any of the log files mentions throttling"""
+    for path in paths:
+        if not path or not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            if THROTTLE_PATTERN.search(read_tail(f, size)):
+                return True
+    return False
+
+def run_limited(backend, command, deadline, attempts=3, fresh_outputs=(), **kwargs):
+    """run_command paced by the backend's RateLimiter
+
+    Runs that report throttling on stderr are retried after the limiter's
+    backoff, up to ``attempts`` times, as long as the retry can start before
+    ``deadline``. ``fresh_outputs`` are removed before every attempt, for
+    tools that append to their output.
+    """
+    limiter = rate_limiter(backend)
+    logs = [kwargs.get("stderr_file")]
+    result = None
+    for attempt in range(attempts):
+        wait = limiter.reserve()
+        if time.time() + wait >= deadline:
+            print_status(f"Not enough time left to run {command[0]} for {backend}", "error")
+            return result
+        time.sleep(wait)
+        for path in fresh_outputs:
+            if os.path.exists(path):
+                os.remove(path)
+        result = run_command(command, timeout=max(1, deadline - time.time()), **kwargs)
+        if not reports_throttling(logs):
+            # Failures for other reasons say nothing about the service's limits
+            if result is not None:
+                limiter.succeeded()
+            return result
+        delay = limiter.throttled()
+        if attempt + 1 < attempts:
+            print_status(f"{backend} is throttling requests, retrying in {delay:.0f}s", "warning")
+    return result
+
+def maxrss_bytes(maxrss):
+    """Convert ru_maxrss to bytes (it is kilobytes everywhere but macOS)"""
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+def record_child_usage(returncode, usage=None):
+    """Add a finished command to the metrics of the stage on this thread"""
+    metrics = getattr(STAGE_CONTEXT, "metrics", None)
+    if metrics is None:
+        return
+    metrics["exit_codes"].append(returncode)
+    if usage is not None:
+        metrics["child_cpu_seconds"] += usage.ru_utime + usage.ru_stime
+        metrics["child_peak_rss_bytes"] = max(metrics["child_peak_rss_bytes"], maxrss_bytes(usage.ru_maxrss))
+
+def record_worker_usage(cpu_seconds, peak_rss_bytes):
+    """Add work done for this thread's stage in a RENDER_POOL worker"""
+    metrics = getattr(STAGE_CONTEXT, "metrics", None)
+    if metrics is not None:
+        metrics["child_cpu_seconds"] += cpu_seconds
+        metrics["child_peak_rss_bytes"] = max(metrics["child_peak_rss_bytes"], peak_rss_bytes or 0)
+
+# Highest VmHWM seen before a reset_peak_rss(), which also clears ru_maxrss
+PROCESS_PEAK_RSS = 0
+PEAK_RSS_LOCK = threading.Lock()
+
+def reset_peak_rss():
+    """Reset this process's RSS high-water mark (Linux), returning True if it was reset"""
+    global PROCESS_PEAK_RSS
+    
+    with PEAK_RSS_LOCK:
+        current = peak_rss()
+        if current is None:
+            return False
+        PROCESS_PEAK_RSS = max(PROCESS_PEAK_RSS, current)
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            return True
+        except OSError:
+            return False
+
+def process_peak_rss():
+    """Peak RSS in bytes since the process started, across reset_peak_rss() calls"""
+    with PEAK_RSS_LOCK:
+        current = peak_rss()
+        if current is None:
+            current = maxrss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        return max(PROCESS_PEAK_RSS, current)
+
+def peak_rss():
+    """RSS high-water mark in bytes since start or reset_peak_rss(), None where unavailable"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def measured(reset, func, *args, **kwargs):
+    """Call ``func`` in a pool worker, returning ``(result, cpu_seconds, peak_rss_bytes)``
+
+    Pool workers run one task at a time, so with ``reset`` the worker's
+    high-water mark is reset for the call; otherwise the peak is the
+    worker's since it started.
+    """
+    reset = reset and reset_peak_rss()
+    cpu = time.process_time()
+    result = func(*args, **kwargs)
+    peak = peak_rss() if reset else process_peak_rss()
+    return result, time.process_time() - cpu, peak
+
+# Stages running in this process; the RSS high-water mark is only reset
+# when a stage starts with no other stage running, see instrument()
+ACTIVE_STAGES = 0
+ACTIVE_STAGES_LOCK = threading.Lock()
+
+def path_size(path):
+    """Size in bytes of a file, or of everything under a directory"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            try:
+                total += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass
+    return total
+
+@contextlib.contextmanager
+def instrument(stage, username, output_dir, outputs=()):
+    """Measure one collector or report stage and hand the result to METRICS
+
+    Records wall time, CPU time (this thread plus every command it ran
+    through run_command and its RENDER_POOL work), the size of ``outputs``
+    under ``output_dir`` and the exit status. ``peak_rss_bytes`` is the
+    largest of its children, its render work and this process. The process
+    figure is the process's peak so far ("rss_scope": "process", also always
+    in ``process_peak_rss_bytes``), or with STAGE_PEAK_RSS the peak during
+    the stage ("stage") when no other stage was running at its start.
+    The stage may set ``metrics["status"]`` to "failed"; an exception marks
+    it "error".
+    """
+    global ACTIVE_STAGES
+    
+    metrics = {"stage": stage, "username": username, "status": "success", "exit_codes": [],
+               "child_cpu_seconds": 0.0, "child_peak_rss_bytes": 0}
+    with ACTIVE_STAGES_LOCK:
+        own_peak = STAGE_PEAK_RSS and ACTIVE_STAGES == 0 and reset_peak_rss()
+        ACTIVE_STAGES += 1
+    previous = getattr(STAGE_CONTEXT, "metrics", None)
+    STAGE_CONTEXT.metrics = metrics
+    started = datetime.now()
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        yield metrics
+    except BaseException:
+        metrics["status"] = "error"
+        raise
+    finally:
+        STAGE_CONTEXT.metrics = previous
+        stage_rss = peak_rss() if own_peak else None
+        with ACTIVE_STAGES_LOCK:
+            ACTIVE_STAGES -= 1
+        process_rss = process_peak_rss()
+        metrics.update({
+            "started": started.isoformat(timespec="seconds"),
+            "wall_seconds": round(time.perf_counter() - wall, 3),
+            "cpu_seconds": round(time.thread_time() - cpu + metrics.pop("child_cpu_seconds"), 3),
+            "peak_rss_bytes": max(stage_rss if stage_rss is not None else process_rss,
+                                  metrics.pop("child_peak_rss_bytes")),
+            "rss_scope": "stage" if stage_rss is not None else "process",
+            "process_peak_rss_bytes": process_rss,
+            "bytes_written": sum(path_size(os.path.join(output_dir, output)) for output in outputs)
+        })
+        if METRICS is not None:
+            METRICS.record(metrics)
+
+class MetricsRecorder:
+    """Write stage metrics as JSON lines and a Prometheus textfile snapshot
+
+    Every stage is appended to ``log_file`` as it finishes. Totals per stage
+    are kept in memory and written to ``textfile`` by write_textfile(), in
+    the format node_exporter's textfile collector reads.
+    """
+    
+    def __init__(self, log_file, textfile=None):
+        self.log_file = Path(log_file)
+        self.textfile = Path(textfile) if textfile else None
+        self.totals = {}
+        self._lock = threading.Lock()
+        ensure_dir(self.log_file.parent)
+    
+    def record(self, metrics):
+        line = json.dumps(metrics)
+        with self._lock:
+            with open(self.log_file, "a") as f:
+                f.write(line + "\n")
+            totals = self.totals.setdefault(metrics["stage"], {
+                "runs": {}, "wall_seconds": 0.0, "cpu_seconds": 0.0, "bytes_written": 0, "peak_rss_bytes": 0
+            })
+            totals["runs"][metrics["status"]] = totals["runs"].get(metrics["status"], 0) + 1
+            totals["wall_seconds"] += metrics["wall_seconds"]
+            totals["cpu_seconds"] += metrics["cpu_seconds"]
+            totals["bytes_written"] += metrics["bytes_written"]
+            totals["peak_rss_bytes"] = max(totals["peak_rss_bytes"], metrics["peak_rss_bytes"])
+    
+    def write_textfile(self):
+        """Replace the textfile snapshot with the current totals"""
+        if self.textfile is None:
+            return
+        series = [
+            ("osint_stage_runs_total", "counter", "Stage runs by exit status"),
+            ("osint_stage_wall_seconds_total", "counter", "Wall-clock time spent in each stage"),
+            ("osint_stage_cpu_seconds_total", "counter", "CPU time of each stage including the tools it ran"),
+            ("osint_stage_bytes_written_total", "counter", "Bytes of output written by each stage"),
+            ("osint_stage_peak_rss_bytes", "gauge", "Largest resident set size of each stage, its tools and render work")
+        ]
+        with self._lock:
+            lines = []
+            for metric, kind, help_text in series:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+                for stage, totals in sorted(self.totals.items()):
+                    if metric == "osint_stage_runs_total":
+                        lines += [f'{metric}{{stage="{stage}",status="{status}"}} {count}'
+                                  for status, count in sorted(totals["runs"].items())]
+                    else:
+                        key = metric[len("osint_stage_"):].replace("_total", "")
+                        lines.append(f'{metric}{{stage="{stage}"}} {round(totals[key], 3)}')
+            lines += ["# HELP osint_last_run_timestamp_seconds When this snapshot was written",
+                      "# TYPE osint_last_run_timestamp_seconds gauge",
+                      f"osint_last_run_timestamp_seconds {time.time():.0f}"]
+            # The collector may read the file at any time, so swap it in atomically
+            ensure_dir(self.textfile.parent)
+            fd, tmp = tempfile.mkstemp(dir=self.textfile.parent, prefix=".metrics-", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, self.textfile)
+
+def profiled(func, profile_file, *args, **kwargs):
+    """Call ``func`` under cProfile and save the stats next to a text summary
+
+    ``profile_file`` can be opened with pstats or snakeviz; the 30 most
+    expensive functions by cumulative time are written to a .txt beside it.
+    """
+    profiler = cProfile.Profile()
     try:
-        if shell:
-            process = subprocess.run(command, shell=True, check=True, 
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                                    text=True)
+        profiler.enable()
+    except ValueError:
+        # Only one profiler can be active at a time (e.g. concurrent batch workers)
+        print_status(f"Another profile is running, not profiling {profile_file}", "warning")
+        return func(*args, **kwargs)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_file)
+        with open(os.path.splitext(profile_file)[0] + ".txt", "w") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(30)
+        print_status(f"Post-processing profile saved to {profile_file}", "success")
+
+class ResultCache:
+    """Content-addressed cache of collector artifacts
+
+    Entries are keyed by a hash of (tool, username, options) and hold copies
+    of the files a collector produced. Entries older than ``ttl`` seconds are
+    ignored, and the least recently used entries are evicted once the cache
+    grows past ``max_bytes``.
+    """
+    
+    def __init__(self, cache_dir, ttl=86400, max_bytes=1024 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(tool, username, options):
+        payload = json.dumps([tool, username, options], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _read_meta(self, entry):
+        try:
+            with open(entry / "meta.json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def restore(self, tool, username, options, output_dir):
+        """Copy a fresh cached entry into output_dir, returning True on a hit"""
+        entry = self.cache_dir / self.key(tool, username, options)
+        meta = self._read_meta(entry)
+        hit = meta is not None and time.time() - meta["created"] <= self.ttl
+        if hit:
+            try:
+                for name in meta["artifacts"]:
+                    source = entry / name
+                    if source.is_dir():
+                        shutil.copytree(source, Path(output_dir) / name, dirs_exist_ok=True)
+                    else:
+                        shutil.copy2(source, Path(output_dir) / name)
+                # Mark the entry as recently used for eviction
+                os.utime(entry / "meta.json")
+            except OSError as e:
+                print_status(f"Ignoring unreadable cache entry for {tool}: {e}", "warning")
+                hit = False
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit
+    
+    def store(self, tool, username, options, output_dir, artifacts):
+        """Copy the named artifacts from output_dir into the cache"""
+        names = [name for name in artifacts if os.path.exists(os.path.join(output_dir, name))]
+        if not names:
+            return
+        ensure_dir(self.cache_dir)
+        staging = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir))
+        try:
+            size = 0
+            for name in names:
+                source = Path(output_dir) / name
+                if source.is_dir():
+                    shutil.copytree(source, staging / name)
+                    size += sum(f.stat().st_size for f in (staging / name).rglob("*") if f.is_file())
+                else:
+                    shutil.copy2(source, staging / name)
+                    size += (staging / name).stat().st_size
+            meta = {
+                "tool": tool,
+                "username": username,
+                "options": options,
+                "created": time.time(),
+                "size": size,
+                "artifacts": names
+            }
+            with open(staging / "meta.json", "w") as f:
+                json.dump(meta, f)
+            
+            entry = self.cache_dir / self.key(tool, username, options)
+            with self._lock:
+                if entry.exists():
+                    shutil.rmtree(entry, ignore_errors=True)
+                os.rename(staging, entry)
+                self._evict()
+        except OSError as e:
+            print_status(f"Could not cache {tool} results: {e}", "warning")
+            shutil.rmtree(staging, ignore_errors=True)
+    
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        entries = []
+        total = 0
+        now = time.time()
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith(".tmp-"):
+                continue
+            meta = self._read_meta(entry)
+            if meta is None or now - meta["created"] > self.ttl:
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            total += meta["size"]
+            entries.append((os.path.getmtime(entry / "meta.json"), meta["size"], entry))
+        
+        entries.sort()
+        while total > self.max_bytes and entries:
+            _, size, entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+def cached_collector(tool, artifacts, options=None, bypass=None):
+    """Serve a run_* collector from RESULT_CACHE when a fresh entry exists
+
+    ``artifacts`` are the file or directory names the collector writes to its
+    output directory, with ``{username}`` placeholders. ``options`` are the
+    tool options that affect its output and are part of the cache key; it
+    may be a callable when the options are only known at run time. The
+    cache is not used at all while ``bypass()`` returns true.
+    """
+    
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(username, output_dir, *args, **kwargs):
+            cache = RESULT_CACHE
+            if cache is None or (bypass is not None and bypass()):
+                return func(username, output_dir, *args, **kwargs)
+            
+            key_options = (options() if callable(options) else options) or {}
+            if cache.restore(tool, username, key_options, output_dir):
+                print_status(f"Using cached {tool} results for {username}", "success")
+                return True
+            
+            success = func(username, output_dir, *args, **kwargs)
+            if success:
+                names = [artifact.format(username=username) for artifact in artifacts]
+                cache.store(tool, username, key_options, output_dir, names)
+            return success
+        wrapper.artifacts = artifacts
+        return wrapper
+    return decorator
+
+class HTTPConnectionPool:
+    """Minimal asyncio HTTP/1.1 client with keep-alive connections per host
+
+    Idle connections are reused for later requests to the same host, and at
+    most ``per_host`` requests are in flight to any one host at a time.
+    """
+    
+    def __init__(self, per_host=4):
+        self.per_host = per_host
+        self._idle = {}
+        self._limits = {}
+        self._ssl = None
+    
+    async def _connect(self, key):
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            ssl_context = self._ssl
+        return await asyncio.open_connection(host, port, ssl=ssl_context)
+    
+    @staticmethod
+    async def _read_response(reader, method):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        version, status = status_line.split(None, 2)[:2]
+        status = int(status)
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or status < 200:
+            body = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Skip any trailer headers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
         else:
-            process = subprocess.run(command, check=True, 
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                                    text=True)
-        return process.stdout
-    except subprocess.CalledProcessError as e:
-        print_status(f"Command failed: {e}", "error")
-        print_status(f"Error output: {e.stderr}", "error")
+            body = await reader.read()
+            keep_alive = False
+        return status, headers, body, keep_alive
+    
+    async def request(self, method, url, headers=None, timeout=10):
+        """Send one request and return ``(status, headers, body)``"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        path = quote(parts.path or "/", safe="/%:@!$&'()*+,;=~")
+        if parts.query:
+            path += "?" + parts.query
+        
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {parts.netloc.rsplit('@', 1)[-1]}",
+            f"User-Agent: {PRESENCE_USER_AGENT}",
+            "Accept: */*",
+            "Accept-Encoding: identity",
+            "Connection: keep-alive"
+        ]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+        
+        async def exchange(reader, writer):
+            writer.write(payload)
+            await writer.drain()
+            return await self._read_response(reader, method)
+        
+        async with self._limits.setdefault(key, asyncio.Semaphore(self.per_host)):
+            for attempt in range(2):
+                idle = self._idle.get(key)
+                reused = bool(idle)
+                if reused:
+                    reader, writer = idle.pop()
+                else:
+                    reader, writer = await asyncio.wait_for(self._connect(key), timeout)
+                try:
+                    status, response_headers, body, keep_alive = await asyncio.wait_for(
+                        exchange(reader, writer), timeout)
+                except asyncio.TimeoutError:
+                    # Checked first: on Python 3.11+ it is a subclass of OSError
+                    writer.close()
+                    raise
+                except (OSError, asyncio.IncompleteReadError):
+                    writer.close()
+                    # The server may have dropped an idle keep-alive connection
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                
+                if keep_alive:
+                    self._idle.setdefault(key, []).append((reader, writer))
+                else:
+                    writer.close()
+                return status, response_headers, body
+    
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+def find_site_manifest():
+    """Return the configured site manifest, or the one shipped with Sherlock"""
+    if PRESENCE_OPTIONS["sites_file"]:
+        return Path(PRESENCE_OPTIONS["sites_file"])
+    for candidate in SITE_MANIFEST_CANDIDATES:
+        if candidate.exists():
+            return candidate
+    return None
+
+def load_site_manifest(path):
+    """Load a Sherlock style site manifest, skipping ``$schema`` style keys"""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {name: site for name, site in data.items()
+            if not name.startswith("$") and isinstance(site, dict) and "url" in site}
+
+def retry_after_seconds(value):
+    """Seconds from a Retry-After header, None if absent or an HTTP date"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
         return None
 
+class PresenceChecker:
+    """Check which sites have an account for one or more usernames
+
+    Sites come from a Sherlock style manifest: ``url`` (with ``{}`` for the
+    username), ``urlMain``, ``urlProbe``, ``errorType`` (``status_code``,
+    ``message`` or ``response_url``, or a list of them), ``errorMsg``,
+    ``errorCode``, ``regexCheck``, ``request_method`` and ``headers``.
+    Results use the same schema as ``{username}_sherlock.json``.
+    """
+    
+    MAX_REDIRECTS = 5
+    # Tries per site while its host answers 429 (or 503 with Retry-After)
+    THROTTLE_ATTEMPTS = 3
+    MAX_THROTTLE_WAIT = 30
+    
+    def __init__(self, sites, timeout=10, max_connections=50, per_host=4):
+        self.sites = sites
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.per_host = per_host
+    
+    async def _fetch(self, pool, method, url, headers, follow_redirects):
+        for _ in range(self.MAX_REDIRECTS + 1):
+            status, response_headers, body = await pool.request(method, url, headers, self.timeout)
+            if not follow_redirects or status not in (301, 302, 303, 307, 308) \
+                    or "location" not in response_headers:
+                break
+            url = urljoin(url, response_headers["location"])
+            if status == 303:
+                method = "GET"
+        return status, response_headers, body
+    
+    @staticmethod
+    def _result(site, username, status="Unknown"):
+        return {
+            "url_main": site.get("urlMain", ""),
+            "url": site["url"].replace("{?}", "{}").replace("{}", username),
+            "status": status,
+            "http_status": None,
+            "response_time_s": None
+        }
+    
+    async def _check_site(self, pool, limit, name, site, username):
+        result = self._result(site, username)
+        
+        regex = site.get("regexCheck")
+        if regex and re.search(regex, username) is None:
+            result["status"] = "Illegal"
+            return username, name, result
+        
+        error_types = site.get("errorType", "status_code")
+        if isinstance(error_types, str):
+            error_types = [error_types]
+        probe_url = site.get("urlProbe", site["url"]).replace("{?}", "{}").replace("{}", username)
+        method = site.get("request_method") or ("HEAD" if error_types == ["status_code"] else "GET")
+        
+        limiter = rate_limiter(f"presence_host:{urlsplit(probe_url).hostname}")
+        for attempt in range(self.THROTTLE_ATTEMPTS):
+            await limiter.acquire_async()
+            start = time.monotonic()
+            try:
+                async with limit:
+                    status, headers, body = await self._fetch(pool, method, probe_url, site.get("headers"),
+                                                              "response_url" not in error_types)
+            except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                result["error"] = str(e) or type(e).__name__
+                return username, name, result
+            if status not in (429, 503) or ("retry-after" not in headers and status == 503):
+                limiter.succeeded()
+                break
+            # Give up on this site rather than stall the whole check behind a long backoff
+            if limiter.throttled(retry_after_seconds(headers.get("retry-after"))) > self.MAX_THROTTLE_WAIT:
+                break
+        
+        result["http_status"] = status
+        result["response_time_s"] = round(time.monotonic() - start, 3)
+        if status == 429 or (status == 503 and "retry-after" in headers):
+            result["error"] = "Rate limited"
+            return username, name, result
+        
+        claimed = True
+        for error_type in error_types:
+            if error_type == "message":
+                messages = site.get("errorMsg") or []
+                if isinstance(messages, str):
+                    messages = [messages]
+                text = body.decode("utf-8", errors="replace")
+                claimed = claimed and not any(message in text for message in messages)
+            elif error_type == "status_code":
+                codes = site.get("errorCode") or []
+                if isinstance(codes, int):
+                    codes = [codes]
+                claimed = claimed and 200 <= status < 300 and status not in codes
+            else:
+                claimed = claimed and 200 <= status < 300
+        result["status"] = "Claimed" if claimed else "Available"
+        return username, name, result
+    
+    async def _check_all(self, usernames, skip=None):
+        pool = HTTPConnectionPool(self.per_host)
+        limit = asyncio.Semaphore(self.max_connections)
+        results = {username: dict.fromkeys(self.sites) for username in usernames}
+        try:
+            checks = []
+            for username in usernames:
+                for name, site in self.sites.items():
+                    if skip is not None and skip(name, username):
+                        results[username][name] = {**self._result(site, username, "Available"), "cached": True}
+                    else:
+                        checks.append(self._check_site(pool, limit, name, site, username))
+            for username, name, result in await asyncio.gather(*checks):
+                results[username][name] = result
+        finally:
+            pool.close()
+        return results
+    
+    def check(self, usernames, skip=None):
+        """Check every site for every username, returning ``{username: {site: result}}``
+
+        Pairs for which ``skip(site, username)`` is true are not probed and
+        reported as Available with ``"cached": true``.
+        """
+        return asyncio.run(self._check_all(list(usernames), skip))
+
+def write_presence_results(username, output_dir, sites):
+    """Write presence results in Sherlock's text and JSON layout"""
+    output_file = os.path.join(output_dir, f"{username}_sherlock.txt")
+    output_json = os.path.join(output_dir, f"{username}_sherlock.json")
+    
+    with open(output_json, "w") as f:
+        json.dump(sites, f, indent=4)
+    
+    claimed = [site["url"] for site in sites.values() if site["status"] == "Claimed"]
+    with open(output_file, "w") as f:
+        for url in claimed:
+            f.write(url + "\n")
+        f.write(f"Total Websites Username Detected On : {len(claimed)}\n")
+    return output_file, output_json
+
+def run_presence_check(username, output_dir, sites_file):
+    """Check username presence with the built-in async engine"""
+    try:
+        sites = load_site_manifest(sites_file)
+        checker = PresenceChecker(sites, timeout=PRESENCE_OPTIONS["timeout"],
+                                  max_connections=PRESENCE_OPTIONS["max_connections"],
+                                  per_host=PRESENCE_OPTIONS["per_host"])
+        results = checker.check([username])[username]
+        output_file, output_json = write_presence_results(username, output_dir, results)
+        
+        claimed = sum(1 for site in results.values() if site["status"] == "Claimed")
+        errors = sum(1 for site in results.values() if "error" in site)
+        print_status(f"Username {username} found on {claimed} of {len(sites)} sites", "success")
+        print_status(f"Presence results saved to {output_file} and {output_json}", "success")
+        # Mostly failed probes (no network, wrong manifest) must not be cached or
+        # marked complete, so the stage is retried by the next run or --resume
+        if errors > len(results) * PRESENCE_MAX_ERROR_SHARE:
+            print_status(f"Presence check failed for {errors} of {len(results)} sites", "error")
+            return False
+        return True
+    except Exception as e:
+        print_status(f"Error running presence check: {e}", "error")
+        return False
+
+class NegativeCache:
+    """Persistent Bloom filter of (site, username) pairs that had no account
+
+    Pairs go into the generation for the current ``ttl / GENERATIONS``
+    period and are forgotten once that generation is ``ttl`` old, so an
+    account registered after a miss is found again eventually. Once a
+    generation holds ``capacity`` pairs about ``error_rate`` of lookups are
+    false positives, i.e. sites skipped that should have been probed.
+    
+    save() merges with the file on disk under a lock, so concurrent sweeps
+    do not lose each other's entries.
+    """
+    
+    GENERATIONS = 7
+    
+    def __init__(self, path, ttl=7 * 86400, capacity=1000000, error_rate=0.001):
+        self.path = Path(path)
+        self.period = max(1, ttl // self.GENERATIONS)
+        self.bits = int(-capacity * math.log(error_rate) / math.log(2) ** 2) // 8 * 8 + 8
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.added = 0
+        self.generations = self._live(self._read())
+    
+    def _now(self):
+        return int(time.time() // self.period)
+    
+    def _live(self, generations):
+        oldest = self._now() - self.GENERATIONS
+        return {index: bits for index, bits in generations.items() if index > oldest}
+    
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                header = json.loads(f.readline())
+                if (header["bits"], header["hashes"], header["period"]) != (self.bits, self.hashes, self.period):
+                    # Different size or expiry, so the old bits cannot be reused
+                    return {}
+                return {index: bytearray(f.read(self.bits // 8)) for index in header["generations"]}
+        except (OSError, ValueError, KeyError):
+            return {}
+    
+    def _positions(self, site, username):
+        digest = hashlib.blake2b(f"{site}\0{username}".encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.bits for i in range(self.hashes)]
+    
+    def __contains__(self, pair):
+        positions = self._positions(*pair)
+        return any(all(bits[position >> 3] >> (position & 7) & 1 for position in positions)
+                   for bits in self.generations.values())
+    
+    def add(self, site, username):
+        index = self._now()
+        if index not in self.generations:
+            self.generations[index] = bytearray(self.bits // 8)
+        bits = self.generations[index]
+        for position in self._positions(site, username):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.added += 1
+    
+    def save(self):
+        ensure_dir(self.path.parent)
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            for index, bits in self._read().items():
+                if index in self.generations:
+                    merged = int.from_bytes(bits, "little") | int.from_bytes(self.generations[index], "little")
+                    self.generations[index] = bytearray(merged.to_bytes(len(bits), "little"))
+                else:
+                    self.generations[index] = bits
+            self.generations = self._live(self.generations)
+            
+            header = {"bits": self.bits, "hashes": self.hashes, "period": self.period,
+                      "generations": list(self.generations)}
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".negatives-", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                for bits in self.generations.values():
+                    f.write(bits)
+            os.replace(tmp, self.path)
+
+LEET_SUBSTITUTIONS = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "5", "t": "7"}
+VARIANT_SEPARATORS = ("", ".", "_", "-")
+VARIANT_SUFFIXES = ("1", "2", "01", "12", "123", "007", "99", "00")
+
+def leet_variants(word):
+    """``word`` with each substitutable letter replaced on its own, then all at once"""
+    positions = [i for i, char in enumerate(word) if char in LEET_SUBSTITUTIONS]
+    variants = [word[:i] + LEET_SUBSTITUTIONS[word[i]] + word[i + 1:] for i in positions]
+    if len(positions) > 1:
+        variants.append("".join(LEET_SUBSTITUTIONS.get(char, char) for char in word))
+    return variants
+
+def expand_username(username, separators=True, digits=True, leet=True, limit=500):
+    """Likely spellings of ``username``, the original first, without duplicates
+
+    ``JohnDoe99`` splits into the words john and doe and the number 99. The
+    words are rejoined with each separator, the number is swapped for common
+    suffixes (or dropped), and with ``leet`` every candidate is also written
+    in leetspeak. Most sites ignore case, so candidates differing only in
+    case count as duplicates.
+    """
+    tokens = re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", username)
+    number = tokens.pop() if len(tokens) > 1 and tokens[-1].isdigit() else ""
+    words = [token.lower() for token in tokens]
+    
+    stem = username[:len(username) - len(number)].rstrip("._-") if number else username
+    bases = [stem] + ([separator.join(words) for separator in VARIANT_SEPARATORS] if separators and words else [])
+    suffixes = [number] + (["", *VARIANT_SUFFIXES] if digits else [])
+    candidates = [base + suffix for base in bases for suffix in suffixes]
+    if leet:
+        candidates += [variant + suffix for base in bases for variant in leet_variants(base.lower())
+                       for suffix in suffixes]
+    
+    unique = {}
+    for candidate in [username] + candidates:
+        if USERNAME_PATTERN.fullmatch(candidate) and candidate.lower() not in unique:
+            unique[candidate.lower()] = candidate
+    return list(unique.values())[:max(1, limit)]
+
+def presence_cache_options():
+    """Cache key options for run_sherlock, which depend on the engine in use
+
+    The native engine's manifest is keyed by content as well as path, so
+    editing or updating it in place invalidates the cached results.
+    """
+    sites_file = find_site_manifest() if PRESENCE_OPTIONS["engine"] == "native" else None
+    return {"timeout": 10, "sites": str(sites_file) if sites_file else None,
+            "sites_checksum": file_checksum(sites_file) if sites_file else None}
+
+@cached_collector("sherlock", ["{username}_sherlock.txt", "{username}_sherlock.json"],
+                  options=presence_cache_options)
 def run_sherlock(username, output_dir):
-    """Run Sherlock to find username across platforms"""
+    """Run Sherlock to find username across platforms
+
+    Uses the built-in async presence checker unless ``--engine sherlock`` is
+    given or no site manifest can be found.
+    """
+    if PRESENCE_OPTIONS["engine"] == "native":
+        sites_file = find_site_manifest()
+        if sites_file is not None:
+            print_status(f"Checking presence of {username} with built-in engine ({sites_file})...")
+            return run_presence_check(username, output_dir, sites_file)
+        print_status("No site manifest found, falling back to the Sherlock subprocess", "warning")
+    
     print_status(f"Running Sherlock for {username}...")
     
     output_file = os.path.join(output_dir, f"{username}_sherlock.txt")
     output_json = os.path.join(output_dir, f"{username}_sherlock.json")
     
     try:
-        # Change to Sherlock directory
-        os.chdir(SHERLOCK_PATH)
-        
         # Run Sherlock with JSON output
         command = [
             "python3", "sherlock.py", username,
@@ -85,10 +1184,11 @@ def run_sherlock(username, output_dir):
             "--timeout", "10"
         ]
         
-        result = run_command(command)
-        
-        # Change back to original directory
-        os.chdir(SCRIPT_DIR)
+        # A retry would re-check every site, so throttling is only used to pace later runs
+        result = run_limited("sherlock", command, time.time() + STAGE_TIMEOUTS["sherlock"], attempts=1,
+                             cwd=SHERLOCK_PATH, label=f"Sherlock ({username})",
+                             stdout_file=stage_log(output_dir, "sherlock"),
+                             stderr_file=stage_log(output_dir, "sherlock.stderr"))
         
         if result:
             print_status(f"Sherlock results saved to {output_file} and {output_json}", "success")
@@ -96,53 +1196,201 @@ def run_sherlock(username, output_dir):
         return False
     except Exception as e:
         print_status(f"Error running Sherlock: {e}", "error")
-        # Change back to original directory
-        os.chdir(SCRIPT_DIR)
         return False
 
+# Collects profile, followers and tweets in one Twint process, see run_twint()
+TWINT_DRIVER = """
+import sys
+import twint
+
+username, profile_file, followers_file, tweets_file, followers_limit, tweets_limit, since = sys.argv[1:8]
+
+def config(output, limit=None, since=None):
+    c = twint.Config()
+    c.Username = username
+    c.Store_json = True
+    c.Output = output
+    c.Hide_output = True
+    if limit:
+        c.Limit = int(limit)
+    if since:
+        c.Since = since
+    return c
+
+failed = 0
+for name, run, c in (("profile", twint.run.Lookup, config(profile_file)),
+                     ("followers", twint.run.Followers, config(followers_file, followers_limit)),
+                     ("tweets", twint.run.Search, config(tweets_file, tweets_limit, since))):
+    try:
+        run(c)
+        print("finished", name, flush=True)
+    except Exception as e:
+        failed = 1
+        print("failed", name, e, file=sys.stderr, flush=True)
+sys.exit(failed)
+"""
+
+@functools.lru_cache(maxsize=None)
+def twint_module_available():
+    """True if python3 can import twint, so run_twint can use a single pass"""
+    try:
+        return subprocess.run(["python3", "-c", "import twint"], stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL, timeout=60).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+def read_followers(followers_file):
+    """Usernames in a Twint followers file (JSON lines or one name per line)"""
+    followers = []
+    with open(followers_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                follower = json.loads(line)
+            except ValueError:
+                follower = line
+            if isinstance(follower, dict):
+                follower = follower.get("username")
+            if follower:
+                followers.append(str(follower))
+    return followers
+
+def merge_twitter_archive(archive, username, output_dir, collected):
+    """Merge one incremental Twint run into the archive
+
+    New tweets are added to the archive and the tweets file is rewritten
+    with the full deduplicated history, so the reports see every tweet
+    collected so far. The follower set is compared with the previous run
+    and the adds and removes are written to
+    ``{username}_twitter_followers_delta.json``.
+    """
+    tweets_file = os.path.join(output_dir, f"{username}_twitter_tweets.json")
+    followers_file = os.path.join(output_dir, f"{username}_twitter_followers.json")
+    
+    if "tweets" in collected:
+        before = archive.count_tweets(username)
+        if os.path.exists(tweets_file):
+            with open(tweets_file, "r") as f:
+                fetched = sum(1 for line in f if line.strip())
+            if before and fetched >= TWINT_OPTIONS["tweets_limit"]:
+                print_status(f"Fetched the maximum of {fetched} new tweets for {username}, "
+                             "older new tweets may be missing", "warning")
+            archive.ingest_tweets(username, tweets_file)
+        total = archive.count_tweets(username)
+        temp_file = tweets_file + ".part"
+        with open(temp_file, "w") as f:
+            archive.export_tweets(username, f)
+        os.replace(temp_file, tweets_file)
+        print_status(f"{total - before} new tweets for {username}, {total} in the archive", "success")
+    
+    if "followers" in collected and os.path.exists(followers_file):
+        followers = read_followers(followers_file)
+        first_run = not archive.has_followers(username)
+        complete = len(followers) < TWINT_OPTIONS["followers_limit"]
+        added, removed = archive.update_followers(username, followers, complete)
+        delta = {
+            "username": username,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "first_run": first_run,
+            "complete": complete,
+            "added": added,
+            "removed": removed
+        }
+        with open(os.path.join(output_dir, f"{username}_twitter_followers_delta.json"), "w") as f:
+            json.dump(delta, f, indent=4)
+        print_status(f"Followers of {username}: {len(added)} added, {len(removed)} removed", "success")
+
+def twint_cache_options():
+    """Cache key options for run_twint"""
+    return {"followers_limit": TWINT_OPTIONS["followers_limit"], "tweets_limit": TWINT_OPTIONS["tweets_limit"],
+            "profile": "user-full"}
+
+# Incremental runs must reach Twint to update the archive and follower delta;
+# the archive checkpoint already skips the tweets that were fetched before
+@cached_collector("twint", ["{username}_twitter.json", "{username}_twitter_followers.json",
+                            "{username}_twitter_tweets.json"],
+                  options=twint_cache_options, bypass=lambda: TWINT_OPTIONS["incremental"])
 def run_twint(username, output_dir):
-    """Run Twint to gather Twitter information"""
+    """Run Twint to gather Twitter information
+
+    Profile, followers and tweets are collected in one Twint process when
+    python3 can import the twint module, otherwise with three runs of the
+    twint command. Every run is paced by the shared "twitter" rate limiter
+    and retried when Twint reports throttling.
+    
+    With --incremental only tweets newer than the newest one in the archive
+    are fetched, and the result is merged into the archive.
+    """
     print_status(f"Running Twint for Twitter user {username}...")
     
     output_file = os.path.join(output_dir, f"{username}_twitter.json")
+    followers_file = os.path.join(output_dir, f"{username}_twitter_followers.json")
+    tweets_file = os.path.join(output_dir, f"{username}_twitter_tweets.json")
+    outputs = {"profile": output_file, "followers": followers_file, "tweets": tweets_file}
+    
+    # All Twint runs for this user share one deadline
+    deadline = time.time() + STAGE_TIMEOUTS["twint"]
+    
+    def twint(command, name, paths):
+        stdout_file = stage_log(output_dir, f"twint_{name}")
+        stderr_file = stage_log(output_dir, f"twint_{name}.stderr")
+        return run_limited("twitter", command, deadline, fresh_outputs=paths, label=f"Twint {name} ({username})",
+                           stdout_file=stdout_file, stderr_file=stderr_file)
+    
+    archive = None
+    since = None
+    followers_limit = str(TWINT_OPTIONS["followers_limit"])
+    tweets_limit = str(TWINT_OPTIONS["tweets_limit"])
     
     try:
-        # Basic profile information
-        command = [
-            "twint", "-u", username,
-            "--json", "-o", output_file
-        ]
-        
-        run_command(command)
-        print_status(f"Twitter information saved to {output_file}", "success")
+        if TWINT_OPTIONS["incremental"]:
+            archive = TweetStore(TWINT_OPTIONS["archive"], shared=TWINT_OPTIONS["shared_archive"])
+            since = archive.newest_timestamp(username)
+            if since:
+                print_status(f"Fetching tweets of {username} newer than {since}")
         
-        # Get followers (limited to 100 to avoid rate limiting)
-        followers_file = os.path.join(output_dir, f"{username}_twitter_followers.json")
-        command = [
-            "twint", "-u", username,
-            "--followers", "--limit", "100",
-            "--json", "-o", followers_file
-        ]
-        
-        run_command(command)
-        print_status(f"Twitter followers saved to {followers_file}", "success")
+        if twint_module_available():
+            command = ["python3", "-c", TWINT_DRIVER, username, output_file, followers_file, tweets_file,
+                       followers_limit, tweets_limit, since or ""]
+            twint(command, "all", list(outputs.values()))
+            # The driver reports each part it finished on stdout
+            with open(stage_log(output_dir, "twint_all"), "r") as f:
+                finished = {line.split()[1] for line in f if line.startswith("finished ")}
+            failed = [name for name in outputs if name not in finished]
+        else:
+            # Followers and tweets are limited to avoid rate limiting
+            commands = {
+                "profile": ["twint", "-u", username, "--user-full"],
+                "followers": ["twint", "-u", username, "--followers", "--limit", followers_limit],
+                "tweets": ["twint", "-u", username, "--limit", tweets_limit] + (["--since", since] if since else [])
+            }
+            failed = [name for name, command in commands.items()
+                      if twint(command + ["--json", "--hide-output", "-o", outputs[name]], name,
+                               [outputs[name]]) is None]
         
-        # Get tweets (limited to 100 to avoid rate limiting)
-        tweets_file = os.path.join(output_dir, f"{username}_twitter_tweets.json")
-        command = [
-            "twint", "-u", username,
-            "--limit", "100",
-            "--json", "-o", tweets_file
-        ]
+        for name, path in outputs.items():
+            if name not in failed:
+                print_status(f"Twitter {name} saved to {path}", "success")
         
-        run_command(command)
-        print_status(f"Twitter tweets saved to {tweets_file}", "success")
+        if archive is not None:
+            merge_twitter_archive(archive, username, output_dir,
+                                  [name for name in outputs if name not in failed])
         
+        if failed:
+            print_status(f"Twint failed for: {', '.join(failed)}", "error")
+            return False
         return True
     except Exception as e:
         print_status(f"Error running Twint: {e}", "error")
         return False
+    finally:
+        if archive is not None:
+            archive.close()
 
+@cached_collector("instaloader", ["{username}_instagram"],
+                  options={"videos": False, "captions": False})
 def run_instaloader(username, output_dir):
     """Run Instaloader to gather Instagram information"""
     print_status(f"Running Instaloader for Instagram user {username}...")
@@ -163,13 +1411,21 @@ def run_instaloader(username, output_dir):
             f"profile_{username}"
         ]
         
-        run_command(command)
+        stdout_file = stage_log(output_dir, "instaloader")
+        stderr_file = stage_log(output_dir, "instaloader.stderr")
+        result = run_limited("instagram", command, time.time() + STAGE_TIMEOUTS["instaloader"],
+                             label=f"Instaloader ({username})",
+                             stdout_file=stdout_file, stderr_file=stderr_file)
+        if result is None:
+            return False
         print_status(f"Instagram information saved to {insta_dir}", "success")
         return True
     except Exception as e:
         print_status(f"Error running Instaloader: {e}", "error")
         return False
 
+@cached_collector("social_analyzer", ["{username}_social_analyzer.json"],
+                  options={"metadata": True})
 def run_social_analyzer(username, output_dir):
     """Run Social-Analyzer to find and analyze profiles"""
     print_status(f"Running Social-Analyzer for {username}...")
@@ -177,9 +1433,6 @@ def run_social_analyzer(username, output_dir):
     output_file = os.path.join(output_dir, f"{username}_social_analyzer.json")
     
     try:
-        # Change to Social-Analyzer directory
-        os.chdir(SOCIAL_ANALYZER_PATH)
-        
         # Run Social-Analyzer
         command = [
             "python3", "app.py",
@@ -188,418 +1441,2943 @@ def run_social_analyzer(username, output_dir):
             "--output", "json"
         ]
         
-        result = run_command(command)
-        
-        # Change back to original directory
-        os.chdir(SCRIPT_DIR)
+        # Stream the output to a partial file and only move it into place on success
+        partial_file = output_file + ".part"
+        result = run_limited("social_analyzer", command, time.time() + STAGE_TIMEOUTS["social_analyzer"],
+                             cwd=SOCIAL_ANALYZER_PATH, label=f"Social-Analyzer ({username})",
+                             stdout_file=partial_file,
+                             stderr_file=stage_log(output_dir, "social_analyzer.stderr"))
         
-        if result:
-            # Save output to file
-            with open(output_file, "w") as f:
-                f.write(result)
-                
+        if result and os.path.getsize(partial_file) > 0:
+            os.replace(partial_file, output_file)
             print_status(f"Social-Analyzer results saved to {output_file}", "success")
             return True
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
         return False
     except Exception as e:
         print_status(f"Error running Social-Analyzer: {e}", "error")
-        # Change back to original directory
-        os.chdir(SCRIPT_DIR)
         return False
 
-def generate_visualizations(username, output_dir):
-    """Generate visualizations from the collected data"""
-    print_status(f"Generating visualizations for {username}...")
+def run_stages(stages, jobs=4, on_finish=None):
+    """Run independent collector stages concurrently
+
+    ``stages`` is a list of ``(name, function, args)`` tuples. At most ``jobs``
+    stages run at the same time. Returns a dict mapping stage name to the
+    value returned by its function (False if the stage raised).
+    ``on_finish(name, success, duration)`` is called as each stage ends.
+    Each function takes ``(username, output_dir, ...)`` and is measured with
+    instrument().
+    """
+    def timed(name, func, func_args):
+        start = time.time()
+        username, output_dir = func_args[:2]
+        outputs = [artifact.format(username=username) for artifact in getattr(func, "artifacts", ())]
+        with instrument(name, username, output_dir, outputs) as metrics:
+            try:
+                success = func(*func_args)
+            except Exception as e:
+                print_status(f"Stage {name} crashed: {e}", "error")
+                success = False
+            if not success:
+                metrics["status"] = "failed"
+        if on_finish is not None:
+            on_finish(name, success, time.time() - start)
+        return success
     
-    viz_dir = os.path.join(output_dir, "visualizations")
-    ensure_dir(viz_dir)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {executor.submit(timed, name, func, func_args): name for name, func, func_args in stages}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+MANIFEST_NAME = "manifest.json"
+
+def file_checksum(path):
+    """SHA-256 of a file, or of the names and sizes of a directory's files"""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                digest.update(f"{os.path.relpath(full, path)}:{os.path.getsize(full)}\n".encode("utf-8"))
+    else:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+class StageManifest:
+    """Status, duration and output checksums of every stage of a run
+
+    The manifest lives in the search directory so an interrupted or partly
+    failed run can be resumed with only the stages that still need work.
+    """
     
-    # Try to read Sherlock results
-    try:
-        sherlock_json = os.path.join(output_dir, f"{username}_sherlock.json")
-        if os.path.exists(sherlock_json):
-            with open(sherlock_json, "r") as f:
-                sherlock_data = json.load(f)
-                
-            # Create platform presence visualization
-            platforms = []
-            found = []
-            
-            for platform, data in sherlock_data.items():
-                platforms.append(platform)
-                found.append(1 if data.get("status") == "Claimed" else 0)
-            
-            if platforms:
-                df = pd.DataFrame({"Platform": platforms, "Found": found})
-                df = df.sort_values("Found", ascending=False)
-                
-                plt.figure(figsize=(12, 8))
-                sns.barplot(x="Platform", y="Found", data=df)
-                plt.xticks(rotation=90)
-                plt.title(f"Platform Presence for {username}")
-                plt.tight_layout()
-                plt.savefig(os.path.join(viz_dir, f"{username}_platform_presence.png"))
-                print_status(f"Platform presence visualization saved to {viz_dir}", "success")
-    except Exception as e:
-        print_status(f"Error generating Sherlock visualization: {e}", "warning")
+    def __init__(self, search_dir, username=None):
+        self.search_dir = Path(search_dir)
+        self.path = self.search_dir / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self.data = {"username": username, "stages": {}}
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                self.data = json.load(f)
     
-    # Try to read Twitter results
-    try:
-        tweets_file = os.path.join(output_dir, f"{username}_twitter_tweets.json")
-        if os.path.exists(tweets_file):
-            tweets = []
-            with open(tweets_file, "r") as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            tweets.append(json.loads(line))
-                        except:
-                            pass
-            
-            if tweets:
-                # Extract dates and create time series
-                dates = []
-                for tweet in tweets:
-                    try:
-                        date = tweet.get("date")
-                        if date:
-                            dates.append(date)
-                    except:
-                        pass
-                
-                if dates:
-                    date_counts = {}
-                    for date in dates:
-                        date = date.split(" ")[0]  # Get just the date part
-                        if date in date_counts:
-                            date_counts[date] += 1
-                        else:
-                            date_counts[date] = 1
-                    
-                    df = pd.DataFrame({"Date": list(date_counts.keys()), "Count": list(date_counts.values())})
-                    df["Date"] = pd.to_datetime(df["Date"])
-                    df = df.sort_values("Date")
-                    
-                    plt.figure(figsize=(12, 6))
-                    plt.plot(df["Date"], df["Count"])
-                    plt.title(f"Tweet Activity for {username}")
-                    plt.xlabel("Date")
-                    plt.ylabel("Number of Tweets")
-                    plt.tight_layout()
-                    plt.savefig(os.path.join(viz_dir, f"{username}_tweet_activity.png"))
-                    print_status(f"Tweet activity visualization saved to {viz_dir}", "success")
-    except Exception as e:
-        print_status(f"Error generating Twitter visualization: {e}", "warning")
-
-def generate_html_report(username, output_dir):
-    """Generate an HTML report from all collected data"""
-    print_status(f"Generating HTML report for {username}...")
+    @property
+    def username(self):
+        return self.data.get("username")
     
-    report_file = os.path.join(output_dir, f"{username}_report.html")
-    viz_dir = os.path.join(output_dir, "visualizations")
+    @property
+    def stages(self):
+        return self.data["stages"]
     
-    # Basic HTML template
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>OSINT Report for {username}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; }}
-            h1, h2, h3 {{ color: #333; }}
-            .container {{ max-width: 1200px; margin: 0 auto; }}
-            .section {{ margin-bottom: 30px; border: 1px solid #ddd; padding: 20px; border-radius: 5px; }}
-            .platform-found {{ color: green; }}
-            .platform-not-found {{ color: red; }}
-            table {{ border-collapse: collapse; width: 100%; }}
-            th, td {{ text-align: left; padding: 8px; border-bottom: 1px solid #ddd; }}
-            th {{ background-color: #f2f2f2; }}
-            img {{ max-width: 100%; height: auto; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>OSINT Report for {username}</h1>
-            <p>Generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-    """
-    
-    # Add Sherlock results
-    sherlock_json = os.path.join(output_dir, f"{username}_sherlock.json")
-    if os.path.exists(sherlock_json):
-        try:
-            with open(sherlock_json, "r") as f:
-                sherlock_data = json.load(f)
-            
-            html += """
-            <div class="section">
-                <h2>Platform Presence (Sherlock Results)</h2>
-                <table>
-                    <tr>
-                        <th>Platform</th>
-                        <th>Status</th>
-                        <th>URL</th>
-                    </tr>
-            """
-            
-            for platform, data in sherlock_data.items():
-                status = data.get("status", "Unknown")
-                url = data.get("url", "")
-                status_class = "platform-found" if status == "Claimed" else "platform-not-found"
-                
-                html += f"""
-                <tr>
-                    <td>{platform}</td>
-                    <td class="{status_class}">{status}</td>
-                    <td><a href="{url}" target="_blank">{url}</a></td>
-                </tr>
-                """
-            
-            html += """
-                </table>
-            </div>
-            """
-            
-            # Add platform presence visualization
-            platform_viz = os.path.join(viz_dir, f"{username}_platform_presence.png")
-            if os.path.exists(platform_viz):
-                # Get relative path
-                rel_path = os.path.relpath(platform_viz, output_dir)
-                html += f"""
-                <div class="section">
-                    <h2>Platform Presence Visualization</h2>
-                    <img src="{rel_path}" alt="Platform Presence Visualization">
-                </div>
-                """
-        except Exception as e:
-            print_status(f"Error adding Sherlock results to report: {e}", "warning")
+    def is_complete(self, name):
+        """True if the stage succeeded and its outputs are unchanged on disk"""
+        stage = self.stages.get(name)
+        if not stage or stage["status"] != "success":
+            return False
+        for output, checksum in stage["outputs"].items():
+            path = self.search_dir / output
+            if not path.exists() or file_checksum(path) != checksum:
+                return False
+        return True
     
-    # Add Twitter results
-    tweets_file = os.path.join(output_dir, f"{username}_twitter_tweets.json")
-    if os.path.exists(tweets_file):
-        try:
-            tweets = []
+    def record(self, name, success, duration, outputs=()):
+        """Record a finished stage and rewrite the manifest atomically"""
+        checksums = {}
+        for output in outputs:
+            path = self.search_dir / output
+            if path.exists():
+                checksums[output] = file_checksum(path)
+        with self._lock:
+            self.stages[name] = {
+                "status": "success" if success else "failed",
+                "finished": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "duration": round(duration, 2),
+                "outputs": checksums
+            }
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w") as f:
+                json.dump(self.data, f, indent=4)
+            os.replace(temp_path, self.path)
+
+TWEET_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    username TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    date TEXT,
+    timestamp TEXT,
+    has_time INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    retweets INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    PRIMARY KEY (username, id)
+);
+CREATE INDEX IF NOT EXISTS tweets_by_time ON tweets (username, timestamp, id);
+CREATE TABLE IF NOT EXISTS profiles (
+    username TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    collected TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (username, platform)
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS instagram_posts (
+    username TEXT NOT NULL,
+    shortcode TEXT NOT NULL,
+    timestamp TEXT,
+    likes INTEGER NOT NULL DEFAULT 0,
+    comments INTEGER NOT NULL DEFAULT 0,
+    location TEXT,
+    hashtags TEXT,
+    is_video INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (username, shortcode)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS instagram_posts_by_time ON instagram_posts (username, timestamp);
+CREATE TABLE IF NOT EXISTS followers (
+    username TEXT NOT NULL,
+    follower TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (username, follower)
+) WITHOUT ROWID;
+"""
+
+def tweet_record(username, line):
+    """Turn one line of Twint output into a row of the tweets table
+
+    Returns None for blank or malformed lines. The original line is kept as
+    ``data`` so exports and reports reproduce it exactly.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        tweet = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(tweet, dict):
+        return None
+    
+    date = str(tweet.get("date") or "")
+    time_of_day = tweet.get("time")
+    # Older Twint output has the time inside "date", newer output splits it out
+    if " " in date or not time_of_day:
+        timestamp, has_time = date[:19] or None, " " in date
+    else:
+        timestamp, has_time = f"{date} {time_of_day}", True
+    
+    def count(key):
+        try:
+            return int(tweet.get(key) or 0)
+        except (TypeError, ValueError):
+            return 0
+    
+    tweet_id = tweet.get("id")
+    try:
+        tweet_id = int(tweet_id)
+    except (TypeError, ValueError):
+        # Fall back to a stable id derived from the content
+        tweet_id = int.from_bytes(hashlib.sha1(line.encode()).digest()[:7], "big")
+    return (username, tweet_id, date[:10] or None, timestamp, int(has_time),
+            count("likes_count"), count("retweets_count"), line)
+
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+
+# Profile fields kept from Instaloader's profile JSON
+INSTAGRAM_PROFILE_FIELDS = ["username", "full_name", "biography", "id", "is_private", "is_verified",
+                            "external_url"]
+
+# Instagram directories with fewer post files than this are indexed in-process
+INSTAGRAM_PARALLEL_MIN = 2000
+INSTAGRAM_CHUNK_SIZE = 250
+
+def edge_count(node, *keys):
+    """First ``node[key]["count"]`` (or plain number) present among ``keys``"""
+    for key in keys:
+        value = node.get(key)
+        if isinstance(value, dict):
+            value = value.get("count")
+        if isinstance(value, (int, float)):
+            return int(value)
+    return 0
+
+def instagram_record(path):
+    """Read one Instaloader JSON file
+
+    Returns ``("post", row)`` with a row for the instagram_posts table (less
+    the username), ``("profile", fields)``, or None for anything else.
+    """
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    node = data.get("node", data)
+    if not isinstance(node, dict):
+        return None
+    node_type = (data.get("instaloader") or {}).get("node_type")
+    
+    if node_type == "Profile" or (node_type is None and "edge_followed_by" in node):
+        profile = {field: node.get(field) for field in INSTAGRAM_PROFILE_FIELDS if field in node}
+        profile["followers"] = edge_count(node, "edge_followed_by")
+        profile["following"] = edge_count(node, "edge_follow")
+        profile["posts"] = edge_count(node, "edge_owner_to_timeline_media")
+        return "profile", profile
+    
+    iphone = node.get("iphone_struct") or {}
+    taken_at = node.get("taken_at_timestamp") or iphone.get("taken_at")
+    if taken_at is None:
+        return None
+    
+    caption = ""
+    edges = (node.get("edge_media_to_caption") or {}).get("edges") or []
+    if edges:
+        caption = (edges[0].get("node") or {}).get("text") or ""
+    elif isinstance(node.get("caption"), str):
+        caption = node["caption"]
+    hashtags = sorted({tag.lower() for tag in HASHTAG_PATTERN.findall(caption)})
+    location = node.get("location") or {}
+    
+    shortcode = node.get("shortcode") or node.get("code") or os.path.splitext(os.path.basename(path))[0]
+    try:
+        timestamp = datetime.fromtimestamp(int(taken_at)).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    likes = edge_count(node, "edge_media_preview_like", "edge_liked_by", "likes") or \
+        edge_count(iphone, "like_count")
+    comments = edge_count(node, "edge_media_to_comment", "edge_media_to_parent_comment", "comments") or \
+        edge_count(iphone, "comment_count")
+    return "post", (shortcode, timestamp, likes, comments,
+                    location.get("name") if isinstance(location, dict) else None,
+                    " ".join(hashtags), int(bool(node.get("is_video"))))
+
+def index_instagram_files(paths):
+    """instagram_record() for a chunk of files, run in a worker process"""
+    return [record for record in map(instagram_record, paths) if record is not None]
+
+class TweetStore:
+    """Indexed SQLite store of collected tweets and profiles
+
+    Tweets are keyed by (username, tweet id) and indexed by timestamp, so
+    date-range queries and the report generators read only the rows they
+    need instead of re-parsing the Twint output. Twint's files are left in
+    place; export_tweets() writes the same line-delimited format back out.
+    With ``shared`` a rollback journal is used instead of WAL, as for
+    JobQueue.
+    """
+    
+    def __init__(self, db_file, shared=False):
+        self.db_file = str(db_file)
+        # The Twitter archive is shared by concurrent batch workers
+        self.conn = sqlite3.connect(self.db_file, timeout=30)
+        self.conn.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(TWEET_STORE_SCHEMA)
+    
+    def close(self):
+        self.conn.close()
+    
+    def _is_current(self, path):
+        """True if ``path`` was ingested and has not changed since"""
+        stat = os.stat(path)
+        row = self.conn.execute("SELECT size, mtime FROM sources WHERE path = ?", (path,)).fetchone()
+        return row == (stat.st_size, stat.st_mtime)
+    
+    def _mark_ingested(self, path):
+        stat = os.stat(path)
+        self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                          (path, stat.st_size, stat.st_mtime))
+    
+    def ingest_tweets(self, username, tweets_file):
+        """Merge a Twint tweets file, replacing tweets already stored by id"""
+        with self.conn, open(tweets_file, "r") as f:
+            rows = (tweet_record(username, line) for line in f)
+            self.conn.executemany("INSERT OR REPLACE INTO tweets VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  (row for row in rows if row is not None))
+            self._mark_ingested(tweets_file)
+    
+    def ingest_twint(self, username, output_dir):
+        """Load the Twint tweets and profile of ``username`` if they changed"""
+        tweets_file = os.path.abspath(os.path.join(output_dir, f"{username}_twitter_tweets.json"))
+        if os.path.exists(tweets_file) and not self._is_current(tweets_file):
+            self.ingest_tweets(username, tweets_file)
+        
+        profile_file = os.path.abspath(os.path.join(output_dir, f"{username}_twitter.json"))
+        if os.path.exists(profile_file) and not self._is_current(profile_file):
+            with self.conn, open(profile_file, "r") as f:
+                # Twint writes the profile as the first JSON line
+                line = next((line.strip() for line in f if line.strip()), None)
+                if line:
+                    collected = datetime.fromtimestamp(os.path.getmtime(profile_file))
+                    self.conn.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)",
+                                      (username, "twitter", collected.strftime("%Y-%m-%d %H:%M:%S"), line))
+                self._mark_ingested(profile_file)
+    
+    def _select(self, columns, username, since=None, until=None, order=""):
+        """Query tweets of ``username`` with ``since <= timestamp < until``"""
+        query = f"SELECT {columns} FROM tweets WHERE username = ?"
+        params = [username]
+        if since:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        if until:
+            query += " AND timestamp < ?"
+            params.append(until)
+        return query + order, params
+    
+    def count_tweets(self, username, since=None, until=None):
+        query, params = self._select("COUNT(*)", username, since, until)
+        return self.conn.execute(query, params).fetchone()[0]
+    
+    def iter_raw_tweets(self, username, since=None, until=None):
+        """Yield the original JSON lines, newest first like Twint writes them"""
+        query, params = self._select("data", username, since, until,
+                                     " ORDER BY timestamp DESC, id DESC")
+        for (data,) in self.conn.execute(query, params):
+            yield data
+    
+    def iter_tweets(self, username, since=None, until=None):
+        for data in self.iter_raw_tweets(username, since, until):
+            yield json.loads(data)
+    
+    def tweet_frame(self, username, since=None, until=None):
+        """Timestamp/likes/retweets columns for analytics, see load_tweet_frame()"""
+        import pandas as pd
+        
+        query, params = self._select("timestamp, has_time, likes, retweets", username, since, until)
+        df = pd.read_sql_query(query, self.conn, params=params)
+        frame = pd.DataFrame({
+            "timestamp": pd.to_datetime(df["timestamp"], errors="coerce", format="ISO8601"),
+            "likes": df["likes"].astype("int64"),
+            "retweets": df["retweets"].astype("int64")
+        })
+        frame = frame.dropna(subset=["timestamp"])
+        frame.attrs["has_time"] = bool(df["has_time"].any())
+        return frame
+    
+    def ingest_instagram(self, username, insta_dir, workers=None):
+        """Index the post metadata in an Instaloader directory if it changed
+
+        Files are parsed in chunks, in worker processes for large
+        directories, and only the compact rows are kept, so memory use does
+        not grow with the number of posts.
+        """
+        paths = []
+        total_size = 0
+        newest = 0.0
+        for root, _, files in os.walk(insta_dir):
+            for filename in files:
+                if filename.endswith(".json"):
+                    path = os.path.join(root, filename)
+                    stat = os.stat(path)
+                    paths.append(path)
+                    total_size += stat.st_size
+                    newest = max(newest, stat.st_mtime)
+        
+        source = os.path.abspath(insta_dir)
+        fingerprint = (total_size + len(paths), newest)
+        row = self.conn.execute("SELECT size, mtime FROM sources WHERE path = ?", (source,)).fetchone()
+        if row == fingerprint:
+            return
+        
+        chunks = [paths[i:i + INSTAGRAM_CHUNK_SIZE] for i in range(0, len(paths), INSTAGRAM_CHUNK_SIZE)]
+        pool = None
+        workers = workers or min(4, os.cpu_count() or 1)
+        if len(paths) >= INSTAGRAM_PARALLEL_MIN and workers > 1:
+            pool = RENDER_POOL or ProcessPoolExecutor(max_workers=workers,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+        try:
+            batches = pool.map(index_instagram_files, chunks) if pool else map(index_instagram_files, chunks)
+            with self.conn:
+                self.conn.execute("DELETE FROM instagram_posts WHERE username = ?", (username,))
+                for records in batches:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO instagram_posts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        ((username, *row) for kind, row in records if kind == "post"))
+                    for kind, profile in records:
+                        if kind == "profile":
+                            self.conn.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)",
+                                              (username, "instagram", datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                               json.dumps(profile)))
+                self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (source, *fingerprint))
+        finally:
+            if pool is not None and pool is not RENDER_POOL:
+                pool.shutdown()
+    
+    def iter_instagram_posts(self, username):
+        """Yield indexed posts as dicts, newest first"""
+        columns = ["shortcode", "timestamp", "likes", "comments", "location", "hashtags", "is_video"]
+        for row in self.conn.execute(f"SELECT {', '.join(columns)} FROM instagram_posts WHERE username = ? "
+                                     "ORDER BY timestamp DESC", (username,)):
+            yield dict(zip(columns, row))
+    
+    def instagram_summary(self, username, top=20):
+        """Post counts, engagement, monthly activity, hashtags and locations"""
+        profile = self.profile(username, "instagram")
+        posts, first, last, likes, comments, videos = self.conn.execute(
+            "SELECT COUNT(*), MIN(timestamp), MAX(timestamp), TOTAL(likes), TOTAL(comments), TOTAL(is_video) "
+            "FROM instagram_posts WHERE username = ?", (username,)).fetchone()
+        if not posts and profile is None:
+            return None
+        
+        months = self.conn.execute(
+            "SELECT substr(timestamp, 1, 7) AS month, COUNT(*), TOTAL(likes), TOTAL(comments) "
+            "FROM instagram_posts WHERE username = ? GROUP BY month ORDER BY month", (username,)).fetchall()
+        locations = self.conn.execute(
+            "SELECT location, COUNT(*) AS posts FROM instagram_posts WHERE username = ? AND location IS NOT NULL "
+            "GROUP BY location ORDER BY posts DESC, location LIMIT ?", (username, top)).fetchall()
+        hashtags = {}
+        for (tags,) in self.conn.execute("SELECT hashtags FROM instagram_posts WHERE username = ? "
+                                         "AND hashtags != ''", (username,)):
+            for tag in tags.split():
+                hashtags[tag] = hashtags.get(tag, 0) + 1
+        
+        return {
+            "profile": profile,
+            "posts": posts,
+            "videos": int(videos),
+            "first": first,
+            "last": last,
+            "likes": int(likes),
+            "comments": int(comments),
+            "mean_likes": round(likes / posts, 2) if posts else 0,
+            "mean_comments": round(comments / posts, 2) if posts else 0,
+            "monthly": {
+                "months": [row[0] for row in months],
+                "posts": [row[1] for row in months],
+                "likes": [int(row[2]) for row in months],
+                "comments": [int(row[3]) for row in months]
+            },
+            "top_hashtags": sorted(hashtags.items(), key=lambda item: (-item[1], item[0]))[:top],
+            "top_locations": [list(row) for row in locations]
+        }
+    
+    def newest_timestamp(self, username):
+        """Timestamp of the newest stored tweet, the checkpoint for --incremental"""
+        row = self.conn.execute("SELECT MAX(timestamp) FROM tweets WHERE username = ?", (username,)).fetchone()
+        return row[0]
+    
+    def has_followers(self, username):
+        return self.conn.execute("SELECT 1 FROM followers WHERE username = ? LIMIT 1",
+                                 (username,)).fetchone() is not None
+    
+    def update_followers(self, username, followers, complete):
+        """Merge the follower set from one run and return ``(added, removed)``
+
+        Followers that are missing from the new set only count as removed
+        when ``complete`` is true, i.e. the listing was not cut off by a limit.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current = set(followers)
+        with self.conn:
+            known = {row[0] for row in self.conn.execute(
+                "SELECT follower FROM followers WHERE username = ? AND active = 1", (username,))}
+            added = sorted(current - known)
+            removed = sorted(known - current) if complete else []
+            self.conn.executemany(
+                "INSERT INTO followers VALUES (?, ?, ?, ?, 1) ON CONFLICT (username, follower) "
+                "DO UPDATE SET last_seen = excluded.last_seen, active = 1",
+                ((username, follower, now, now) for follower in current))
+            self.conn.executemany("UPDATE followers SET active = 0 WHERE username = ? AND follower = ?",
+                                  ((username, follower) for follower in removed))
+        return added, removed
+    
+    def profile(self, username, platform):
+        row = self.conn.execute("SELECT data FROM profiles WHERE username = ? AND platform = ?",
+                                (username, platform)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def export_tweets(self, username, handle, since=None, until=None):
+        """Write tweets to an open text file in Twint's line-delimited format"""
+        count = 0
+        for data in self.iter_raw_tweets(username, since, until):
+            handle.write(data + "\n")
+            count += 1
+        return count
+
+RUN_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    search_dir TEXT NOT NULL,
+    finished TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_username ON runs (username, finished);
+CREATE TABLE IF NOT EXISTS findings (
+    username TEXT NOT NULL,
+    platform TEXT NOT NULL COLLATE NOCASE,
+    status TEXT NOT NULL,
+    url TEXT,
+    run_id INTEGER NOT NULL,
+    seen TEXT NOT NULL,
+    PRIMARY KEY (username, platform)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS findings_by_platform ON findings (platform, status, username);
+"""
+
+# Statuses that count as the username existing on a platform
+FOUND_STATUSES = ("Claimed", "Detected")
+
+class RunIndex:
+    """SQLite index of the findings of every run under the results directory
+
+    ``findings`` holds the latest status and URL of each (username,
+    platform) pair and which run reported it, ``runs`` every indexed run.
+    Both are indexed for the lookups of the ``query`` subcommand, so they
+    never have to walk the search directories. Social-Analyzer detections
+    are recorded under the profile's host name with status "Detected".
+    
+    ``shared`` selects a rollback journal (True) or WAL (False) as for
+    JobQueue; None keeps the journal mode an existing index already has.
+    """
+    
+    def __init__(self, db_file, shared=False):
+        self.db_file = str(db_file)
+        self._lock = threading.Lock()
+        # Several processes may share the results directory
+        self.conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        if shared is not None:
+            self.conn.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(RUN_INDEX_SCHEMA)
+    
+    def close(self):
+        self.conn.close()
+    
+    @staticmethod
+    def findings(results):
+        """Yield ``(platform, status, url)`` for every site a run checked"""
+        for hit in results.iter_platform_hits():
+            yield hit.platform, hit.status, hit.url
+    
+    def add_run(self, results, finished=None):
+        """Record a finished run, keeping the newest status of each platform"""
+        finished = finished or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self.conn:
+            run_id = self.conn.execute("INSERT INTO runs (username, search_dir, finished) VALUES (?, ?, ?)",
+                                       (results.username, str(Path(results.output_dir).resolve()),
+                                        finished)).lastrowid
+            self.conn.executemany(
+                "INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (username, platform) DO UPDATE SET status = excluded.status, "
+                "url = excluded.url, run_id = excluded.run_id, seen = excluded.seen "
+                "WHERE excluded.seen >= findings.seen",
+                ((results.username, platform, status, url, run_id, finished)
+                 for platform, status, url in self.findings(results)))
+        return run_id
+    
+    def usernames_on(self, platform, statuses=FOUND_STATUSES):
+        marks = ",".join("?" * len(statuses))
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT username, status, url, seen FROM findings WHERE platform = ? AND status IN ({marks}) "
+                "ORDER BY username", (platform, *statuses)).fetchall()
+    
+    def shared_platforms(self, first, second, statuses=FOUND_STATUSES):
+        marks = ",".join("?" * len(statuses))
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT a.platform, a.url, b.url FROM findings a JOIN findings b "
+                f"ON b.username = ? AND b.platform = a.platform AND b.status IN ({marks}) "
+                f"WHERE a.username = ? AND a.status IN ({marks}) ORDER BY a.platform",
+                (second, *statuses, first, *statuses)).fetchall()
+    
+    def user_findings(self, username, statuses=FOUND_STATUSES):
+        marks = ",".join("?" * len(statuses))
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT platform, status, url, seen FROM findings WHERE username = ? AND status IN ({marks}) "
+                "ORDER BY platform", (username, *statuses)).fetchall()
+    
+    def runs(self, username):
+        """``(finished, search_dir)`` of every indexed run of ``username``, newest first"""
+        with self._lock:
+            return self.conn.execute("SELECT finished, search_dir FROM runs WHERE username = ? "
+                                     "ORDER BY finished DESC", (username,)).fetchall()
+    
+    def latest_runs(self, count=2):
+        """Yield ``(username, [search_dir, ...])`` with each username's newest distinct runs first"""
+        username, dirs = None, []
+        for name, search_dir in self.conn.execute("SELECT username, search_dir FROM runs "
+                                                  "ORDER BY username, finished DESC"):
+            if name != username:
+                if dirs:
+                    yield username, dirs
+                username, dirs = name, []
+            if len(dirs) < count and search_dir not in dirs:
+                dirs.append(search_dir)
+        if dirs:
+            yield username, dirs
+    
+    def rebuild(self, results_root):
+        """Index every search directory under ``results_root``, oldest first"""
+        runs = []
+        for manifest_file in Path(results_root).glob(f"*/{MANIFEST_NAME}"):
+            try:
+                manifest = StageManifest(manifest_file.parent)
+            except (OSError, ValueError):
+                continue
+            reports = manifest.stages.get("reports")
+            if manifest.username and reports:
+                runs.append((reports["finished"], manifest.username, manifest_file.parent))
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM findings")
+            self.conn.execute("DELETE FROM runs")
+        for finished, username, search_dir in sorted(runs):
+            self.add_run(OSINTResults(username, search_dir), finished)
+        return len(runs)
+
+def intern_text(value):
+    """``str(value)`` interned, for the few distinct platform, status and source names"""
+    return None if value is None else sys.intern(str(value))
+
+def as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+class PlatformHit:
+    """One site checked for a username by a presence tool
+
+    ``source`` is the tool ("sherlock" or "social_analyzer") and ``status``
+    one of Claimed, Available, Detected, Illegal or Unknown. Source,
+    platform, status and the site's main URL are interned, so a batch keeps
+    one copy of each.
+    """
+    
+    __slots__ = ("source", "platform", "status", "url", "url_main", "http_status", "response_time")
+    
+    def __init__(self, source, platform, status, url=None, url_main=None, http_status=None, response_time=None):
+        self.source = intern_text(source)
+        self.platform = intern_text(platform)
+        self.status = intern_text(status or "Unknown")
+        self.url = url
+        self.url_main = intern_text(url_main)
+        self.http_status = http_status
+        self.response_time = response_time
+    
+    @property
+    def found(self):
+        return self.status in FOUND_STATUSES
+    
+    def as_dict(self):
+        """The layout of the built-in engine's ``{username}_sherlock.json`` entries"""
+        return {"url_main": self.url_main or "", "url": self.url or "", "status": self.status,
+                "http_status": self.http_status, "response_time_s": self.response_time}
+
+class Profile:
+    """Account details of the target on one platform"""
+    
+    __slots__ = ("platform", "username", "name", "bio", "user_id", "followers", "following")
+    
+    def __init__(self, platform, username, name=None, bio=None, user_id=None, followers=None, following=None):
+        self.platform = intern_text(platform)
+        self.username = username
+        self.name = name
+        self.bio = bio
+        self.user_id = user_id
+        self.followers = followers
+        self.following = following
+    
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+class Post:
+    """One tweet or Instagram post
+
+    ``shares`` is the retweet count and ``text`` is None for Instagram,
+    whose captions are not indexed. Hashtags are a tuple of interned tags.
+    """
+    
+    __slots__ = ("platform", "post_id", "timestamp", "text", "likes", "shares", "comments", "location", "hashtags")
+    
+    def __init__(self, platform, post_id, timestamp, text=None, likes=0, shares=None, comments=0, location=None,
+                 hashtags=()):
+        self.platform = intern_text(platform)
+        self.post_id = post_id
+        self.timestamp = timestamp
+        self.text = text
+        self.likes = likes
+        self.shares = shares
+        self.comments = comments
+        self.location = location
+        self.hashtags = tuple(sys.intern(tag) for tag in hashtags)
+    
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+def sherlock_hits(data):
+    """PlatformHits from Sherlock's JSON output or the built-in engine's"""
+    for platform, site in (data or {}).items():
+        if isinstance(site, dict):
+            yield PlatformHit("sherlock", platform, site.get("status"), site.get("url_user") or site.get("url"),
+                              site.get("url_main"), site.get("http_status"), site.get("response_time_s"))
+
+def social_analyzer_hits(data):
+    """PlatformHits for the profiles Social-Analyzer detected, keyed by host name"""
+    detected = data.get("detected") if isinstance(data, dict) else None
+    for profile in detected or []:
+        link = profile.get("link") if isinstance(profile, dict) else None
+        if link:
+            yield PlatformHit("social_analyzer", urlsplit(link).hostname or link, "Detected", link)
+
+def twint_profile(record=None, tweet=None):
+    """Profile from Twint's --user-full record, filled in from one of the user's tweets
+
+    A tweet's ``id`` is the tweet's own, so the user id is the record's
+    ``id`` or the tweet's ``user_id``.
+    """
+    record = {key: value for key, value in (record or {}).items() if value not in (None, "")}
+    tweet = tweet or {}
+    data = {**tweet, **record}
+    return Profile("twitter", data.get("username"), data.get("name"), data.get("bio"),
+                   record.get("user_id") or record.get("id") or tweet.get("user_id"),
+                   as_int(data.get("followers")), as_int(data.get("following")))
+
+def twint_post(tweet):
+    date = str(tweet.get("date") or "")
+    timestamp = f"{date} {tweet['time']}" if tweet.get("time") and " " not in date else date
+    place = tweet.get("place")
+    return Post("twitter", str(tweet.get("id") or ""), timestamp, tweet.get("tweet", ""),
+                as_int(tweet.get("likes_count")) or 0, as_int(tweet.get("retweets_count")) or 0,
+                as_int(tweet.get("replies_count")) or 0, place if isinstance(place, str) else None,
+                [tag.lstrip("#") for tag in tweet.get("hashtags") or [] if isinstance(tag, str)])
+
+def instagram_profile(data):
+    return Profile("instagram", data.get("username"), data.get("full_name"), data.get("biography"),
+                   data.get("id"), data.get("followers"), data.get("following"))
+
+def instagram_post(row):
+    """Post from a row of TweetStore.iter_instagram_posts()"""
+    return Post("instagram", row["shortcode"], row["timestamp"], None, row["likes"], None, row["comments"],
+                row["location"], (row["hashtags"] or "").split())
+
+class OSINTResults:
+    """Collected artifacts for one username
+
+    Each artifact is read and parsed the first time it is accessed and then
+    cached, so all report generators share a single parse of the data.
+    Missing or unreadable artifacts are None (an empty list for tweets).
+    Tweets are read from the target's TweetStore, falling back to the Twint
+    file if the store cannot be opened.
+    
+    Report generators use the normalized PlatformHit, Profile and Post
+    records; only Social-Analyzer's raw output is kept for the report.
+    """
+    
+    def __init__(self, username, output_dir):
+        self.username = username
+        self.output_dir = output_dir
+    
+    def path(self, suffix):
+        """Return the path of the ``{username}_{suffix}`` artifact"""
+        return os.path.join(self.output_dir, f"{self.username}_{suffix}")
+    
+    def _load_json(self, suffix, label):
+        path = self.path(suffix)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print_status(f"Error reading {label} results: {e}", "warning")
+            return None
+    
+    @cached_property
+    def sherlock(self):
+        """PlatformHits from the Sherlock stage, or None"""
+        data = self._load_json("sherlock.json", "Sherlock")
+        return None if data is None else list(sherlock_hits(data))
+    
+    @cached_property
+    def social_analyzer(self):
+        return self._load_json("social_analyzer.json", "Social-Analyzer")
+    
+    @cached_property
+    def store(self):
+        """TweetStore with the current Twint output ingested, or None"""
+        db_file = self.path("store.db")
+        if not any(os.path.exists(path) for path in (self.path("twitter_tweets.json"),
+                                                     self.path("instagram"), db_file)):
+            return None
+        try:
+            store = TweetStore(db_file)
+            store.ingest_twint(self.username, self.output_dir)
+        except (sqlite3.Error, OSError) as e:
+            print_status(f"Tweet store unavailable, reading Twint output directly: {e}", "warning")
+            return None
+        return store
+    
+    def iter_tweets(self):
+        """Yield tweets one at a time without keeping them all in memory"""
+        if self.store is not None:
+            yield from self.store.iter_tweets(self.username)
+            return
+        
+        tweets_file = self.path("twitter_tweets.json")
+        if not os.path.exists(tweets_file):
+            return
+        try:
             with open(tweets_file, "r") as f:
                 for line in f:
                     if line.strip():
                         try:
-                            tweets.append(json.loads(line))
-                        except:
-                            pass
-            
-            if tweets:
-                # Get user info from first tweet
-                user_info = tweets[0].get("user_id", "")
-                username = tweets[0].get("username", username)
-                name = tweets[0].get("name", "")
-                bio = tweets[0].get("bio", "")
-                
-                html += f"""
-                <div class="section">
-                    <h2>Twitter Profile</h2>
-                    <p><strong>Username:</strong> @{username}</p>
-                    <p><strong>Name:</strong> {name}</p>
-                    <p><strong>Bio:</strong> {bio}</p>
-                    <p><strong>User ID:</strong> {user_info}</p>
-                </div>
-                """
-                
-                # Add tweet activity visualization
-                tweet_viz = os.path.join(viz_dir, f"{username}_tweet_activity.png")
-                if os.path.exists(tweet_viz):
-                    # Get relative path
-                    rel_path = os.path.relpath(tweet_viz, output_dir)
-                    html += f"""
-                    <div class="section">
-                        <h2>Tweet Activity</h2>
-                        <img src="{rel_path}" alt="Tweet Activity Visualization">
-                    </div>
-                    """
-                
-                # Add recent tweets
-                html += """
-                <div class="section">
-                    <h2>Recent Tweets</h2>
-                    <table>
-                        <tr>
-                            <th>Date</th>
-                            <th>Tweet</th>
-                            <th>Likes</th>
-                            <th>Retweets</th>
-                        </tr>
-                """
-                
-                for i, tweet in enumerate(tweets[:10]):  # Show only first 10 tweets
-                    date = tweet.get("date", "")
-                    tweet_text = tweet.get("tweet", "")
-                    likes = tweet.get("likes_count", 0)
-                    retweets = tweet.get("retweets_count", 0)
-                    
-                    html += f"""
-                    <tr>
-                        <td>{date}</td>
-                        <td>{tweet_text}</td>
-                        <td>{likes}</td>
-                        <td>{retweets}</td>
-                    </tr>
-                    """
-                
-                html += """
-                    </table>
-                </div>
-                """
-        except Exception as e:
-            print_status(f"Error adding Twitter results to report: {e}", "warning")
+                            tweet = json.loads(line)
+                        except ValueError:
+                            continue
+                        yield tweet
+        except OSError as e:
+            print_status(f"Error reading Twitter results: {e}", "warning")
+
+    @cached_property
+    def instagram(self):
+        """Summary of the indexed Instagram posts and profile, or None"""
+        insta_dir = self.path("instagram")
+        if self.store is None or not os.path.isdir(insta_dir):
+            return None
+        try:
+            self.store.ingest_instagram(self.username, insta_dir)
+            return self.store.instagram_summary(self.username)
+        except (sqlite3.Error, OSError) as e:
+            print_status(f"Error indexing Instagram results: {e}", "warning")
+            return None
     
-    # Close HTML
-    html += """
-        </div>
-    </body>
-    </html>
+    def iter_platform_hits(self):
+        """PlatformHits of every presence tool"""
+        yield from self.sherlock or ()
+        yield from social_analyzer_hits(self.social_analyzer)
+    
+    @cached_property
+    def twitter_profile(self):
+        """Profile from Twint's user record, filled in from the newest tweet, or None"""
+        record = self.store.profile(self.username, "twitter") if self.store is not None else None
+        tweet = next(self.iter_tweets(), None)
+        tweet = tweet if isinstance(tweet, dict) else None
+        return twint_profile(record, tweet) if record or tweet else None
+    
+    @cached_property
+    def instagram_profile(self):
+        profile = self.instagram["profile"] if self.instagram else None
+        return instagram_profile(profile) if profile else None
+    
+    def iter_posts(self, platform):
+        """Yield the "twitter" or "instagram" posts as Post records, newest first"""
+        if platform == "twitter":
+            return map(twint_post, self.iter_tweets())
+        return map(instagram_post, self.iter_instagram_posts())
+    
+    def iter_instagram_posts(self):
+        if self.instagram is None:
+            return iter(())
+        return self.store.iter_instagram_posts(self.username)
+    
+    def tweet_frame(self):
+        """Analytics columns of the tweets, see load_tweet_frame(), or None"""
+        if self.store is not None:
+            return self.store.tweet_frame(self.username)
+        tweets_file = self.path("twitter_tweets.json")
+        if os.path.exists(tweets_file):
+            return load_tweet_frame(tweets_file)
+        return None
+
+TWEET_COLUMNS = ["date", "time", "likes_count", "retweets_count"]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+def iter_tweet_columns(tweets_file):
+    """Yield TWEET_COLUMNS tuples from a tweets file, skipping malformed lines"""
+    with open(tweets_file, "r") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    tweet = json.loads(line)
+                except ValueError:
+                    continue
+                yield tuple(tweet.get(column) for column in TWEET_COLUMNS)
+
+def load_tweet_frame(tweets_file, chunksize=200000):
+    """Parse the Twint tweets file into typed timestamp/likes/retweets columns
+
+    Only the columns needed for analytics are kept, so the full tweet dicts
+    are never held in memory at once. pyarrow's multi-threaded JSON reader is
+    used when it is installed, with pandas and then a line-by-line parse as
+    fallbacks for files it rejects.
     """
+    import pandas as pd
     
-    # Write HTML to file
-    with open(report_file, "w") as f:
-        f.write(html)
+    df = None
+    try:
+        import pyarrow
+        import pyarrow.json
+        
+        schema = pyarrow.schema([
+            ("date", pyarrow.string()),
+            ("time", pyarrow.string()),
+            ("likes_count", pyarrow.int64()),
+            ("retweets_count", pyarrow.int64())
+        ])
+        options = pyarrow.json.ParseOptions(explicit_schema=schema, unexpected_field_behavior="ignore")
+        df = pyarrow.json.read_json(tweets_file, parse_options=options).to_pandas()
+    except (ImportError, ValueError):
+        pass
     
-    print_status(f"HTML report saved to {report_file}", "success")
-    return report_file
+    if df is None:
+        frames = []
+        try:
+            with pd.read_json(tweets_file, lines=True, chunksize=chunksize,
+                              dtype=False, convert_dates=False) as reader:
+                for chunk in reader:
+                    frames.append(chunk.reindex(columns=TWEET_COLUMNS))
+        except ValueError:
+            # pandas rejects the whole file on a malformed line, so parse it ourselves
+            frames = [pd.DataFrame.from_records(iter_tweet_columns(tweets_file), columns=TWEET_COLUMNS)]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=TWEET_COLUMNS)
+    
+    date = df["date"].astype("string")
+    time_of_day = df["time"].astype("string")
+    # Older Twint output has the time inside "date", newer output splits it out
+    stamp = date.where(date.str.contains(" ", na=False) | time_of_day.isna(), date + " " + time_of_day)
+    
+    frame = pd.DataFrame({
+        "timestamp": pd.to_datetime(stamp, errors="coerce", format="ISO8601"),
+        "likes": pd.to_numeric(df["likes_count"], errors="coerce").fillna(0).astype("int64"),
+        "retweets": pd.to_numeric(df["retweets_count"], errors="coerce").fillna(0).astype("int64")
+    })
+    frame = frame.dropna(subset=["timestamp"])
+    frame.attrs["has_time"] = bool(time_of_day.notna().any() or date.str.contains(" ", na=False).any())
+    return frame
 
-def generate_report(username, output_dir):
-    """Generate a comprehensive report from all tools"""
-    print_status(f"Generating comprehensive report for {username}...")
+def analyze_tweet_activity(df):
+    """Daily, hourly and weekday-by-hour activity and engagement aggregates
+
+    ``df`` is a frame from load_tweet_frame() or TweetStore.tweet_frame().
+    Returns a JSON-serialisable dict, or None when there are no dated tweets.
+    Hourly aggregates are None when the tweets carry no time of day.
+    """
+    import numpy as np
+    
+    if df is None or df.empty:
+        return None
     
-    report = {
-        "username": username,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "platforms": {}
+    timestamps = df["timestamp"]
+    daily = df.groupby(timestamps.dt.normalize()).agg(
+        tweets=("likes", "size"), likes=("likes", "sum"), retweets=("retweets", "sum"))
+    
+    hourly = weekday_hour = None
+    if df.attrs["has_time"]:
+        hours = timestamps.dt.hour.to_numpy()
+        hourly = np.bincount(hours, minlength=24).tolist()
+        cells = timestamps.dt.weekday.to_numpy() * 24 + hours
+        weekday_hour = np.bincount(cells, minlength=7 * 24).reshape(7, 24).tolist()
+    
+    return {
+        "tweets": int(len(df)),
+        "first": timestamps.min().strftime("%Y-%m-%d %H:%M:%S"),
+        "last": timestamps.max().strftime("%Y-%m-%d %H:%M:%S"),
+        "daily": {
+            "dates": daily.index.strftime("%Y-%m-%d").tolist(),
+            "tweets": daily["tweets"].tolist(),
+            "likes": daily["likes"].tolist(),
+            "retweets": daily["retweets"].tolist()
+        },
+        "hourly": hourly,
+        "weekday_hour": weekday_hour,
+        "engagement": {
+            "likes": int(df["likes"].sum()),
+            "retweets": int(df["retweets"].sum()),
+            "mean_likes": round(float(df["likes"].mean()), 2),
+            "mean_retweets": round(float(df["retweets"].mean()), 2)
+        }
     }
+
+def render_charts(username, viz_dir, data):
+    """Render charts for one target and return ``(chart, path, error)`` tuples
+
+    Uses explicit Agg Figure objects instead of pyplot, so nothing is kept in
+    global state once the figures go out of scope. This is a top-level
+    function so it can run in a RENDER_POOL worker process.
+    """
+    import pandas as pd
+    import seaborn as sns
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    rendered = []
+    
+    if data.get("platforms"):
+        path = os.path.join(viz_dir, f"{username}_platform_presence.png")
+        try:
+            df = pd.DataFrame({"Platform": data["platforms"], "Found": data["found"]})
+            df = df.sort_values("Found", ascending=False)
+            
+            fig = Figure(figsize=(12, 8))
+            FigureCanvasAgg(fig)
+            ax = fig.subplots()
+            sns.barplot(x="Platform", y="Found", data=df, ax=ax)
+            ax.tick_params(axis="x", labelrotation=90)
+            ax.set_title(f"Platform Presence for {username}")
+            fig.tight_layout()
+            fig.savefig(path)
+            rendered.append(("Platform presence", path, None))
+        except Exception as e:
+            rendered.append(("Platform presence", path, str(e)))
+    
+    activity = data.get("activity")
+    if activity:
+        daily = activity["daily"]
+        dates = pd.to_datetime(daily["dates"])
+        
+        path = os.path.join(viz_dir, f"{username}_tweet_activity.png")
+        try:
+            fig = Figure(figsize=(12, 6))
+            FigureCanvasAgg(fig)
+            ax = fig.subplots()
+            ax.plot(dates, daily["tweets"])
+            ax.set_title(f"Tweet Activity for {username}")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Number of Tweets")
+            fig.tight_layout()
+            fig.savefig(path)
+            rendered.append(("Tweet activity", path, None))
+        except Exception as e:
+            rendered.append(("Tweet activity", path, str(e)))
+        
+        path = os.path.join(viz_dir, f"{username}_engagement.png")
+        try:
+            fig = Figure(figsize=(12, 6))
+            FigureCanvasAgg(fig)
+            ax = fig.subplots()
+            ax.plot(dates, daily["likes"], label="Likes")
+            ax.plot(dates, daily["retweets"], label="Retweets")
+            ax.set_title(f"Daily Engagement for {username}")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Count")
+            ax.legend()
+            fig.tight_layout()
+            fig.savefig(path)
+            rendered.append(("Engagement", path, None))
+        except Exception as e:
+            rendered.append(("Engagement", path, str(e)))
+        
+        if activity["weekday_hour"]:
+            path = os.path.join(viz_dir, f"{username}_activity_heatmap.png")
+            try:
+                fig = Figure(figsize=(12, 5))
+                FigureCanvasAgg(fig)
+                ax = fig.subplots()
+                sns.heatmap(activity["weekday_hour"], ax=ax, cmap="viridis",
+                            xticklabels=list(range(24)), yticklabels=WEEKDAYS)
+                ax.set_title(f"Tweets by Weekday and Hour for {username}")
+                ax.set_xlabel("Hour of Day")
+                fig.tight_layout()
+                fig.savefig(path)
+                rendered.append(("Activity heatmap", path, None))
+            except Exception as e:
+                rendered.append(("Activity heatmap", path, str(e)))
+    
+    monthly = data.get("instagram")
+    if monthly:
+        path = os.path.join(viz_dir, f"{username}_instagram_activity.png")
+        try:
+            months = pd.to_datetime(monthly["months"], format="%Y-%m")
+            fig = Figure(figsize=(12, 6))
+            FigureCanvasAgg(fig)
+            ax = fig.subplots()
+            ax.bar(months, monthly["posts"], width=20)
+            ax.set_title(f"Instagram Posts per Month for {username}")
+            ax.set_xlabel("Month")
+            ax.set_ylabel("Number of Posts")
+            likes_ax = ax.twinx()
+            likes_ax.plot(months, monthly["likes"], color="tab:orange")
+            likes_ax.set_ylabel("Likes")
+            fig.tight_layout()
+            fig.savefig(path)
+            rendered.append(("Instagram activity", path, None))
+        except Exception as e:
+            rendered.append(("Instagram activity", path, str(e)))
+    
+    return rendered
+
+def generate_visualizations(username, output_dir, results=None):
+    """Generate visualizations from the collected data
+
+    The chart inputs are extracted here and the drawing is done by
+    render_charts(), in RENDER_POOL when one is configured.
+    """
+    print_status(f"Generating visualizations for {username}...")
+    
+    if results is None:
+        results = OSINTResults(username, output_dir)
+    
+    viz_dir = os.path.join(output_dir, "visualizations")
+    ensure_dir(viz_dir)
+    data = {}
     
     # Try to read Sherlock results
     try:
-        sherlock_json = os.path.join(output_dir, f"{username}_sherlock.json")
-        if os.path.exists(sherlock_json):
-            with open(sherlock_json, "r") as f:
-                sherlock_data = json.load(f)
-                report["platforms"]["sherlock"] = sherlock_data
+        hits = results.sherlock
+        if hits:
+            # Create platform presence visualization
+            data["platforms"] = [hit.platform for hit in hits]
+            data["found"] = [1 if hit.status == "Claimed" else 0 for hit in hits]
     except Exception as e:
-        print_status(f"Error reading Sherlock results: {e}", "warning")
+        print_status(f"Error generating Sherlock visualization: {e}", "warning")
     
     # Try to read Twitter results
     try:
-        tweets_file = os.path.join(output_dir, f"{username}_twitter_tweets.json")
-        if os.path.exists(tweets_file):
-            tweets = []
-            with open(tweets_file, "r") as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            tweets.append(json.loads(line))
-                        except:
-                            pass
-            
-            if tweets:
-                report["platforms"]["twitter"] = {
-                    "profile_data": tweets[0] if tweets else {},
-                    "tweets": tweets
-                }
+        activity = analyze_tweet_activity(results.tweet_frame())
+        if activity:
+            data["activity"] = activity
+            with open(results.path("tweet_analytics.json"), "w") as f:
+                json.dump(activity, f)
     except Exception as e:
-        print_status(f"Error reading Twitter results: {e}", "warning")
+        print_status(f"Error generating Twitter visualization: {e}", "warning")
     
-    # Try to read Social-Analyzer results
     try:
-        social_analyzer_file = os.path.join(output_dir, f"{username}_social_analyzer.json")
-        if os.path.exists(social_analyzer_file):
-            with open(social_analyzer_file, "r") as f:
-                social_analyzer_data = json.load(f)
-                report["platforms"]["social_analyzer"] = social_analyzer_data
+        if results.instagram and results.instagram["posts"]:
+            data["instagram"] = results.instagram["monthly"]
     except Exception as e:
-        print_status(f"Error reading Social-Analyzer results: {e}", "warning")
+        print_status(f"Error generating Instagram visualization: {e}", "warning")
+    
+    try:
+        if RENDER_POOL is not None:
+            rendered, cpu_seconds, peak_rss_bytes = RENDER_POOL.submit(
+                measured, STAGE_PEAK_RSS, render_charts, username, viz_dir, data).result()
+            record_worker_usage(cpu_seconds, peak_rss_bytes)
+        else:
+            rendered = render_charts(username, viz_dir, data)
+    except Exception as e:
+        print_status(f"Error rendering visualizations: {e}", "warning")
+        return
+    
+    for chart, path, error in rendered:
+        if error:
+            print_status(f"Error generating {chart.lower()} visualization: {error}", "warning")
+        else:
+            print_status(f"{chart} visualization saved to {viz_dir}", "success")
+
+HTML_STYLE = """
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        h1, h2, h3 { color: #333; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        .section { margin-bottom: 30px; border: 1px solid #ddd; padding: 20px; border-radius: 5px; }
+        .platform-found { color: green; }
+        .platform-not-found { color: red; }
+        .pagination a { margin-right: 15px; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { text-align: left; padding: 8px; border-bottom: 1px solid #ddd; }
+        th { background-color: #f2f2f2; }
+        img { max-width: 100%; height: auto; }
+"""
+
+HTML_PAGE_START = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <style>{style}</style>
+</head>
+<body>
+    <div class="container">
+        <h1>{title}</h1>
+"""
+
+HTML_PAGE_END = """    </div>
+</body>
+</html>
+"""
+
+HTML_SECTION_START = """        <div class="section">
+            <h2>{title}</h2>
+"""
+
+HTML_SECTION_END = """        </div>
+"""
+
+HTML_TABLE_START = """            <table>
+                <tr>{headers}</tr>
+"""
+
+HTML_TABLE_END = """            </table>
+"""
+
+HTML_IMAGE_SECTION = """        <div class="section">
+            <h2>{title}</h2>
+            <img src="{src}" alt="{title}">
+        </div>
+"""
+
+HTML_PROFILE_SECTION = """        <div class="section">
+            <h2>Twitter Profile</h2>
+            <p><strong>Username:</strong> @{username}</p>
+            <p><strong>Name:</strong> {name}</p>
+            <p><strong>Bio:</strong> {bio}</p>
+            <p><strong>User ID:</strong> {user_id}</p>
+        </div>
+"""
+
+HTML_INSTAGRAM_SECTION = """        <div class="section">
+            <h2>Instagram Profile</h2>
+            <p><strong>Username:</strong> @{username}</p>
+            <p><strong>Name:</strong> {name}</p>
+            <p><strong>Bio:</strong> {bio}</p>
+            <p><strong>Followers:</strong> {followers} &middot; <strong>Following:</strong> {following}</p>
+            <p><strong>Posts indexed:</strong> {posts} ({first} to {last})</p>
+            <p><strong>Likes:</strong> {likes} (mean {mean_likes}) &middot; <strong>Comments:</strong> {comments} (mean {mean_comments})</p>
+        </div>
+"""
+
+HTML_LINK = """            <p class="pagination"><a href="{href}">{text}</a></p>
+"""
+
+SHERLOCK_HEADERS = ["Platform", "Status", "URL"]
+SHERLOCK_ROW = """                <tr><td>{platform}</td><td class="{status_class}">{status}</td><td><a href="{href}" target="_blank" rel="noopener">{url}</a></td></tr>
+"""
+
+TWEET_HEADERS = ["Date", "Tweet", "Likes", "Retweets"]
+TWEET_ROW = """                <tr><td>{date}</td><td>{tweet}</td><td>{likes}</td><td>{retweets}</td></tr>
+"""
+
+POST_HEADERS = ["Date", "Likes", "Comments", "Location", "Hashtags"]
+POST_ROW = """                <tr><td>{date}</td><td>{likes}</td><td>{comments}</td><td>{location}</td><td>{hashtags}</td></tr>
+"""
+
+COUNT_ROW = """                <tr><td>{name}</td><td>{count}</td></tr>
+"""
+
+# Rows per table page; longer tables continue on numbered sub-pages
+HTML_PAGE_SIZE = 500
+
+# Number of tweets shown on the main report page
+HTML_RECENT_TWEETS = 10
+
+def render(template, **fields):
+    """Fill an HTML template, escaping every field"""
+    return template.format(**{name: escape(str(value)) for name, value in fields.items()})
+
+def page_start(title):
+    return HTML_PAGE_START.format(title=escape(title), style=HTML_STYLE)
+
+def table_start(headers):
+    return HTML_TABLE_START.format(headers="".join(f"<th>{escape(header)}</th>" for header in headers))
+
+def sherlock_row(hit):
+    url = hit.url or ""
+    return render(SHERLOCK_ROW, platform=hit.platform, status=hit.status, url=url,
+                  status_class="platform-found" if hit.status == "Claimed" else "platform-not-found",
+                  href=url if url.startswith(("http://", "https://")) else "#")
+
+def post_row(post):
+    return render(POST_ROW, date=post.timestamp or "", likes=post.likes, comments=post.comments,
+                  location=post.location or "", hashtags=" ".join(f"#{tag}" for tag in post.hashtags))
+
+def tweet_row(post):
+    return render(TWEET_ROW, date=post.timestamp, tweet=post.text, likes=post.likes, retweets=post.shares)
+
+class HTMLPager:
+    """Stream table rows into numbered HTML sub-pages of ``page_size`` rows
+
+    Pages are written as rows arrive, so the number of rows does not need to
+    be known in advance and only one page is open at a time.
+    """
+    
+    def __init__(self, pages_dir, name, title, headers, page_size, back_link):
+        self.pages_dir = pages_dir
+        self.name = name
+        self.title = title
+        self.headers = headers
+        self.page_size = page_size
+        self.back_link = back_link
+        self.pages = 0
+        self.rows = 0
+        self._file = None
+    
+    def page_name(self, number):
+        return f"{self.name}_{number}.html"
+    
+    def _open_page(self):
+        self.pages += 1
+        ensure_dir(self.pages_dir)
+        self._file = open(os.path.join(self.pages_dir, self.page_name(self.pages)), "w")
+        self._file.write(page_start(f"{self.title} - page {self.pages}"))
+        self._file.write(render(HTML_LINK, href=self.back_link, text="Back to report"))
+        if self.pages > 1:
+            self._file.write(render(HTML_LINK, href=self.page_name(self.pages - 1), text="Previous page"))
+        self._file.write(table_start(self.headers))
+    
+    def _close_page(self, has_next):
+        self._file.write(HTML_TABLE_END)
+        if has_next:
+            self._file.write(render(HTML_LINK, href=self.page_name(self.pages + 1), text="Next page"))
+        self._file.write(HTML_PAGE_END)
+        self._file.close()
+        self._file = None
+    
+    def add(self, row):
+        if self._file is not None and self.rows % self.page_size == 0:
+            self._close_page(has_next=True)
+        if self._file is None:
+            self._open_page()
+        self._file.write(row)
+        self.rows += 1
+    
+    def close(self):
+        if self._file is not None:
+            self._close_page(has_next=False)
+        return self.pages
+
+def generate_html_report(username, output_dir, results=None, page_size=None):
+    """Generate an HTML report from all collected data
+
+    The report is streamed to disk from templates with every field escaped.
+    Tables longer than ``page_size`` rows (all Sherlock sites, the full tweet
+    history, every Instagram post) continue on sub-pages in ``{username}_report_pages/`` so the
+    main page stays small.
+    """
+    print_status(f"Generating HTML report for {username}...")
+    
+    if results is None:
+        results = OSINTResults(username, output_dir)
+    page_size = page_size or HTML_PAGE_SIZE
+    
+    report_name = f"{username}_report.html"
+    report_file = os.path.join(output_dir, report_name)
+    viz_dir = os.path.join(output_dir, "visualizations")
+    pages_name = f"{username}_report_pages"
+    pages_dir = os.path.join(output_dir, pages_name)
+    
+    # Sub-pages from an earlier run would otherwise be left behind
+    shutil.rmtree(pages_dir, ignore_errors=True)
+    
+    def add_image(f, title, path):
+        if os.path.exists(path):
+            f.write(render(HTML_IMAGE_SECTION, title=title, src=os.path.relpath(path, output_dir)))
     
-    # Save the comprehensive report
-    report_file = os.path.join(output_dir, f"{username}_comprehensive_report.json")
     with open(report_file, "w") as f:
-        json.dump(report, f, indent=4)
+        f.write(page_start(f"OSINT Report for {username}"))
+        f.write(render("        <p>Generated on {timestamp}</p>\n",
+                       timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        
+        # Add Sherlock results
+        hits = results.sherlock
+        if hits is not None:
+            try:
+                f.write(render(HTML_SECTION_START, title="Platform Presence (Sherlock Results)"))
+                f.write(table_start(SHERLOCK_HEADERS))
+                pager = HTMLPager(pages_dir, "sherlock", f"Platform Presence for {username}",
+                                  SHERLOCK_HEADERS, page_size, f"../{report_name}")
+                for i, hit in enumerate(hits):
+                    if i < page_size:
+                        f.write(sherlock_row(hit))
+                    else:
+                        pager.add(sherlock_row(hit))
+                f.write(HTML_TABLE_END)
+                if pager.close():
+                    f.write(render(HTML_LINK, href=f"{pages_name}/{pager.page_name(1)}",
+                                   text=f"Showing {page_size} of {len(hits)} sites. "
+                                        f"More on {pager.pages} further page(s)"))
+                f.write(HTML_SECTION_END)
+                
+                # Add platform presence visualization
+                add_image(f, "Platform Presence Visualization",
+                          os.path.join(viz_dir, f"{username}_platform_presence.png"))
+            except Exception as e:
+                print_status(f"Error adding Sherlock results to report: {e}", "warning")
+        
+        # Add Twitter results
+        tweets = results.iter_posts("twitter")
+        first_tweet = next(tweets, None)
+        if first_tweet is not None:
+            try:
+                profile = results.twitter_profile
+                # Twint's screen name may differ (e.g. in case) from the target the charts are named after
+                screen_name = profile.username or results.username
+                f.write(render(HTML_PROFILE_SECTION, username=screen_name, name=profile.name or "",
+                               bio=profile.bio or "", user_id=profile.user_id or ""))
+                
+                # Add tweet activity visualization
+                add_image(f, "Tweet Activity",
+                          os.path.join(viz_dir, f"{results.username}_tweet_activity.png"))
+                add_image(f, "Tweets by Weekday and Hour",
+                          os.path.join(viz_dir, f"{results.username}_activity_heatmap.png"))
+                add_image(f, "Daily Engagement", os.path.join(viz_dir, f"{results.username}_engagement.png"))
+                
+                # Add recent tweets, and the full history on sub-pages
+                f.write(render(HTML_SECTION_START, title="Recent Tweets"))
+                f.write(table_start(TWEET_HEADERS))
+                pager = HTMLPager(pages_dir, "tweets", f"Tweet History for {screen_name}",
+                                  TWEET_HEADERS, page_size, f"../{report_name}")
+                recent = []
+                for tweet in itertools.chain([first_tweet], tweets):
+                    row = tweet_row(tweet)
+                    if len(recent) < HTML_RECENT_TWEETS:
+                        f.write(row)
+                        recent.append(row)
+                        continue
+                    # Only write history pages once there is more than fits here
+                    if not pager.rows:
+                        for recent_row in recent:
+                            pager.add(recent_row)
+                    pager.add(row)
+                f.write(HTML_TABLE_END)
+                if pager.close():
+                    f.write(render(HTML_LINK, href=f"{pages_name}/{pager.page_name(1)}",
+                                   text=f"Full tweet history ({pager.rows} tweets, {pager.pages} page(s))"))
+                f.write(HTML_SECTION_END)
+            except Exception as e:
+                print_status(f"Error adding Twitter results to report: {e}", "warning")
+        
+        # Add Instagram results
+        instagram = results.instagram
+        if instagram is not None:
+            try:
+                profile = results.instagram_profile or Profile("instagram", results.username)
+                f.write(render(HTML_INSTAGRAM_SECTION, username=profile.username or results.username,
+                               name=profile.name or "", bio=profile.bio or "",
+                               followers=profile.followers if profile.followers is not None else "",
+                               following=profile.following if profile.following is not None else "",
+                               posts=instagram["posts"], first=instagram["first"] or "-",
+                               last=instagram["last"] or "-", likes=instagram["likes"],
+                               mean_likes=instagram["mean_likes"], comments=instagram["comments"],
+                               mean_comments=instagram["mean_comments"]))
+                
+                add_image(f, "Instagram Activity",
+                          os.path.join(viz_dir, f"{results.username}_instagram_activity.png"))
+                
+                for title, header, rows in (("Top Hashtags", "Hashtag", instagram["top_hashtags"]),
+                                            ("Top Locations", "Location", instagram["top_locations"])):
+                    if rows:
+                        f.write(render(HTML_SECTION_START, title=title))
+                        f.write(table_start([header, "Posts"]))
+                        for name, count in rows:
+                            f.write(render(COUNT_ROW, name=f"#{name}" if header == "Hashtag" else name,
+                                           count=count))
+                        f.write(HTML_TABLE_END + HTML_SECTION_END)
+                
+                # Recent posts here, every post on sub-pages
+                f.write(render(HTML_SECTION_START, title="Recent Instagram Posts"))
+                f.write(table_start(POST_HEADERS))
+                pager = HTMLPager(pages_dir, "instagram", f"Instagram Posts of {results.username}",
+                                  POST_HEADERS, page_size, f"../{report_name}")
+                recent = []
+                for post in results.iter_posts("instagram"):
+                    row = post_row(post)
+                    if len(recent) < HTML_RECENT_TWEETS:
+                        f.write(row)
+                        recent.append(row)
+                        continue
+                    if not pager.rows:
+                        for recent_row in recent:
+                            pager.add(recent_row)
+                    pager.add(row)
+                f.write(HTML_TABLE_END)
+                if pager.close():
+                    f.write(render(HTML_LINK, href=f"{pages_name}/{pager.page_name(1)}",
+                                   text=f"All posts ({pager.rows} posts, {pager.pages} page(s))"))
+                f.write(HTML_SECTION_END)
+            except Exception as e:
+                print_status(f"Error adding Instagram results to report: {e}", "warning")
+        
+        f.write(HTML_PAGE_END)
     
-    print_status(f"Comprehensive report saved to {report_file}", "success")
+    print_status(f"HTML report saved to {report_file}", "success")
+    return report_file
+
+REPORT_FORMATS = ("pretty", "compact", "ndjson")
+
+def write_comprehensive_report(results, report_file, report_format="pretty"):
+    """Stream the comprehensive report to disk section by section
+
+    Tweets are copied one at a time from the source file, so memory use does
+    not depend on the number of tweets. "pretty" matches the layout of
+    ``json.dump(report, f, indent=4)``, "compact" drops all whitespace and
+    "ndjson" writes one ``{"type": ..., "data": ...}`` record per line.
+    The Sherlock section and the Twitter profile are written from the
+    normalized records; tweets are Twint's own records.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    tweets = results.iter_tweets()
+    first_tweet = next(tweets, None)
+    sherlock_section = {hit.platform: hit.as_dict() for hit in results.sherlock or ()}
     
-    # Generate HTML report
-    html_report = generate_html_report(username, output_dir)
+    with open(report_file, "w") as f:
+        if report_format == "ndjson":
+            def emit(record_type, data):
+                f.write(json.dumps({"type": record_type, "data": data}, separators=(",", ":")) + "\n")
+            
+            emit("meta", {"username": results.username, "timestamp": timestamp})
+            if results.sherlock is not None:
+                emit("sherlock", sherlock_section)
+            if first_tweet is not None:
+                emit("twitter_profile", results.twitter_profile.as_dict())
+                emit("tweet", first_tweet)
+                for tweet in tweets:
+                    emit("tweet", tweet)
+            if results.instagram is not None:
+                emit("instagram", results.instagram)
+            if results.social_analyzer is not None:
+                emit("social_analyzer", results.social_analyzer)
+            return
+        
+        pretty = report_format == "pretty"
+        separators = (",", ": ") if pretty else (",", ":")
+        colon = separators[1]
+        
+        def newline(level):
+            return "\n" + " " * (4 * level) if pretty else ""
+        
+        def encode(value, level):
+            if not pretty:
+                return json.dumps(value, separators=separators)
+            return json.dumps(value, indent=4, separators=separators).replace("\n", newline(level))
+        
+        sections = []
+        
+        def start_section(key):
+            f.write(("," if sections else "") + newline(2) + f'"{key}"{colon}')
+            sections.append(key)
+        
+        f.write("{" + newline(1) + f'"username"{colon}{encode(results.username, 1)},')
+        f.write(newline(1) + f'"timestamp"{colon}{encode(timestamp, 1)},')
+        f.write(newline(1) + f'"platforms"{colon}{{')
+        
+        if results.sherlock is not None:
+            start_section("sherlock")
+            f.write(encode(sherlock_section, 2))
+        
+        if first_tweet is not None:
+            start_section("twitter")
+            f.write("{" + newline(3) + f'"profile_data"{colon}{encode(results.twitter_profile.as_dict(), 3)},')
+            f.write(newline(3) + f'"tweets"{colon}[' + newline(4) + encode(first_tweet, 4))
+            for tweet in tweets:
+                f.write("," + newline(4) + encode(tweet, 4))
+            f.write(newline(3) + "]" + newline(2) + "}")
+        
+        if results.instagram is not None:
+            start_section("instagram")
+            f.write(encode(results.instagram, 2))
+        
+        if results.social_analyzer is not None:
+            start_section("social_analyzer")
+            f.write(encode(results.social_analyzer, 2))
+        
+        f.write((newline(1) if sections else "") + "}" + newline(0) + "}")
+
+# Sections of a fingerprint file, in the order they are written
+PRESENCE_SECTIONS = ("sherlock", "social_analyzer")
+POST_SECTIONS = ("twitter", "instagram")
+POST_URLS = {"twitter": "https://twitter.com/{username}/status/{id}", "instagram": "https://www.instagram.com/p/{id}/"}
+
+# Posts listed per kind of change in a change report; the counts are always complete
+DIFF_POST_LIMIT = 50
+
+def record_hash(value):
+    return hashlib.blake2b(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"),
+                           digest_size=8).hexdigest()
+
+def fingerprint_path(username, search_dir):
+    return os.path.join(search_dir, f"{username}_fingerprint.ndjson")
+
+def write_fingerprint(results):
+    """Write per-record content hashes of a run for diff_runs()
+
+    The first line is a header with a digest of every section; each further
+    line maps the record keys of one section (site, profile platform or
+    post id) to ``[hash, value]``. Posts hash their text, location and
+    hashtags but not their counts, and keep only the timestamp as value.
+    Sections with no records are left out.
+    """
+    def hashed(records):
+        return ((key, record_hash(value), value) for key, value in records)
     
-    # Generate visualizations
-    generate_visualizations(username, output_dir)
+    sections = {
+        "sherlock": hashed((hit.platform, [hit.status, hit.url]) for hit in results.sherlock or ()),
+        "social_analyzer": hashed((hit.platform, [hit.status, hit.url])
+                                  for hit in social_analyzer_hits(results.social_analyzer)),
+        "profiles": hashed((profile.platform, profile.as_dict())
+                           for profile in (results.twitter_profile, results.instagram_profile) if profile)
+    }
+    for name in POST_SECTIONS:
+        sections[name] = ((post.post_id, record_hash([post.text, post.location, post.hashtags]), post.timestamp)
+                          for post in results.iter_posts(name))
     
-    return report
+    digests = {}
+    path = fingerprint_path(results.username, results.output_dir)
+    # Sections are streamed to a scratch file since the header needs their digests
+    with tempfile.TemporaryFile("w+") as body:
+        for name, records in sections.items():
+            digest = None
+            for key, value_hash, value in records:
+                item = json.dumps(str(key)) + ":" + json.dumps([value_hash, value], separators=(",", ":"), default=str)
+                if digest is None:
+                    digest = hashlib.blake2b(digest_size=8)
+                    body.write(f'{{"section":"{name}","records":{{' + item)
+                else:
+                    body.write("," + item)
+                digest.update(item.encode("utf-8"))
+            if digest is not None:
+                body.write("}}\n")
+                digests[name] = digest.hexdigest()
+        
+        header = {"username": results.username, "search_dir": str(Path(results.output_dir).resolve()),
+                  "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "digests": digests}
+        body.seek(0)
+        fd, tmp = tempfile.mkstemp(dir=results.output_dir, prefix=".fingerprint-", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            shutil.copyfileobj(body, f)
+        os.replace(tmp, path)
+    return path
 
-def main():
-    parser = argparse.ArgumentParser(description="Social Media OSINT Framework for Kali Linux")
-    parser.add_argument("username", help="Username to search for")
-    parser.add_argument("--twitter", action="store_true", help="Run Twitter analysis")
-    parser.add_argument("--instagram", action="store_true", help="Run Instagram analysis")
-    parser.add_argument("--all", action="store_true", help="Run all available tools")
-    parser.add_argument("--output-dir", help="Custom output directory")
+def read_fingerprint(path, section=None):
+    """The header of a fingerprint file, or the records of one of its sections"""
+    prefix = f'{{"section":"{section}",'
+    with open(path, "r") as f:
+        header = json.loads(f.readline())
+        if section is None:
+            return header
+        for line in f:
+            # Only the wanted section is parsed
+            if line.startswith(prefix):
+                return json.loads(line)["records"]
+    return {}
+
+def ensure_fingerprint(username, search_dir):
+    """Fingerprint of a run, written first for runs made before fingerprints existed"""
+    path = fingerprint_path(username, search_dir)
+    if not os.path.exists(path):
+        write_fingerprint(OSINTResults(username, search_dir))
+    return path
+
+def diff_runs(old_file, new_file):
+    """Compact report of what changed between two fingerprinted runs of one username
+
+    Sections with equal digests are skipped without reading their records,
+    and records are compared by hash. Sections missing from either run (a
+    tool that did not run) are not compared.
+    """
+    old, new = read_fingerprint(old_file), read_fingerprint(new_file)
+    changes = {}
+    for section, digest in new["digests"].items():
+        if section not in old["digests"] or old["digests"][section] == digest:
+            continue
+        before, after = read_fingerprint(old_file, section), read_fingerprint(new_file, section)
+        changed = sorted(key for key in before.keys() | after.keys()
+                         if before.get(key, (None,))[0] != after.get(key, (None,))[0])
+        
+        if section in PRESENCE_SECTIONS:
+            found = {}
+            for key in changed:
+                was, now = before.get(key), after.get(key)
+                was_found = was is not None and was[1][0] in FOUND_STATUSES
+                now_found = now is not None and now[1][0] in FOUND_STATUSES
+                if now_found and not was_found:
+                    found.setdefault("claimed", []).append({"platform": key, "url": now[1][1]})
+                elif was_found and not now_found:
+                    found.setdefault("lost", []).append({"platform": key, "url": was[1][1],
+                                                         "status": now[1][0] if now else "Missing"})
+                elif was_found and now_found:
+                    found.setdefault("changed", []).append({"platform": key, "old_url": was[1][1],
+                                                            "url": now[1][1]})
+            # Moves between statuses that are not found (Available, Unknown) are noise
+            if found:
+                changes[section] = found
+        elif section == "profiles":
+            for key in changed:
+                was, now = (before.get(key) or (None, {}))[1], (after.get(key) or (None, {}))[1]
+                fields = {field: [was.get(field), now.get(field)] for field in was.keys() | now.keys()
+                          if was.get(field) != now.get(field)}
+                changes.setdefault("profiles", {})[key] = dict(sorted(fields.items()))
+        else:
+            kinds = {"new": [key for key in changed if key not in before],
+                     "removed": [key for key in changed if key not in after],
+                     "edited": [key for key in changed if key in before and key in after]}
+            posts = {}
+            for kind, keys in kinds.items():
+                if keys:
+                    records = before if kind == "removed" else after
+                    keys.sort(key=lambda key: records[key][1] or "", reverse=True)
+                    posts[kind] = len(keys)
+                    posts[f"{kind}_posts"] = [
+                        {"id": key, "timestamp": records[key][1],
+                         "url": POST_URLS[section].format(username=new["username"], id=key)}
+                        for key in keys[:DIFF_POST_LIMIT]]
+            changes[section] = posts
     
-    args = parser.parse_args()
+    return {
+        "username": new["username"],
+        "old": {"search_dir": old["search_dir"], "created": old["created"]},
+        "new": {"search_dir": new["search_dir"], "created": new["created"]},
+        "changes": changes
+    }
+
+def change_summary(report):
+    """One line describing a change report"""
+    changes = report["changes"]
+    parts = []
+    for section in PRESENCE_SECTIONS:
+        for kind in ("claimed", "lost", "changed"):
+            if changes.get(section, {}).get(kind):
+                parts.append(f"{len(changes[section][kind])} {kind} on {section}")
+    for platform, fields in changes.get("profiles", {}).items():
+        parts.append(f"{platform} profile: {', '.join(fields)}")
+    for section in POST_SECTIONS:
+        for kind in ("new", "removed", "edited"):
+            if changes.get(section, {}).get(kind):
+                parts.append(f"{changes[section][kind]} {kind} {section} posts")
+    return "; ".join(parts) or "no changes"
+
+def previous_run(username, search_dir):
+    """Search directory of the newest other run of ``username``, or None
+
+    Uses the run index when there is one, otherwise the sibling search
+    directories that have a fingerprint.
+    """
+    search_dir = Path(search_dir).resolve()
+    if RUN_INDEX is not None:
+        for _, other in RUN_INDEX.runs(username):
+            if Path(other) != search_dir and os.path.isdir(other):
+                return other
+        return None
+    candidates = []
+    for path in search_dir.parent.glob(f"*/{glob.escape(username)}_fingerprint.ndjson"):
+        if path.parent != search_dir:
+            try:
+                candidates.append((read_fingerprint(path)["created"], str(path.parent)))
+            except (OSError, ValueError, KeyError):
+                continue
+    return max(candidates)[1] if candidates else None
+
+def compare_with_previous(results):
+    """Post-run stage: write ``{username}_changes.json`` against the previous run"""
+    previous = previous_run(results.username, results.output_dir)
+    if previous is None:
+        print_status(f"No earlier run of {results.username} to compare with", "info")
+        return None
+    report = diff_runs(ensure_fingerprint(results.username, previous),
+                       fingerprint_path(results.username, results.output_dir))
+    changes_file = results.path("changes.json")
+    with open(changes_file, "w") as f:
+        json.dump(report, f, indent=2)
+    print_status(f"Changes since {previous}: {change_summary(report)}", "success")
+    return changes_file
+
+def generate_report(username, output_dir, results=None, report_format="pretty", visualize=True, diff=False):
+    """Generate a comprehensive report from all tools"""
+    print_status(f"Generating comprehensive report for {username}...")
     
-    print_banner()
+    # Load every artifact once and share it with the other generators
+    if results is None:
+        results = OSINTResults(username, output_dir)
     
-    # Create results directory
-    ensure_dir(RESULTS_DIR)
+    # Index Instagram posts up front so the indexing shows up as its own stage
+    if os.path.isdir(results.path("instagram")):
+        with instrument("instagram_index", username, output_dir, [f"{username}_store.db"]):
+            results.instagram
     
-    # Create directory for this search
-    if args.output_dir:
-        search_dir = Path(args.output_dir)
-    else:
-        search_dir = RESULTS_DIR / f"{args.username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # Save the comprehensive report
+    extension = "ndjson" if report_format == "ndjson" else "json"
+    report_file = os.path.join(output_dir, f"{username}_comprehensive_report.{extension}")
+    with instrument("report", username, output_dir, [os.path.basename(report_file)]):
+        write_comprehensive_report(results, report_file, report_format)
+    
+    print_status(f"Comprehensive report saved to {report_file}", "success")
+    
+    # Generate visualizations first so the HTML report can embed them
+    if visualize:
+        with instrument("visualizations", username, output_dir,
+                        ["visualizations", f"{username}_tweet_analytics.json"]):
+            generate_visualizations(username, output_dir, results)
+    
+    # Generate HTML report
+    with instrument("html_report", username, output_dir,
+                    [f"{username}_report.html", f"{username}_report_pages"]):
+        html_report = generate_html_report(username, output_dir, results)
     
+    # Record hashes for run-to-run comparisons
+    with instrument("fingerprint", username, output_dir, [os.path.basename(fingerprint_path(username, output_dir))]):
+        write_fingerprint(results)
+    
+    if diff:
+        with instrument("diff", username, output_dir, [f"{username}_changes.json"]):
+            try:
+                compare_with_previous(results)
+            except (OSError, ValueError, sqlite3.Error) as e:
+                print_status(f"Error comparing with the previous run: {e}", "warning")
+    
+    # Make the findings searchable across runs
+    if RUN_INDEX is not None:
+        with instrument("index", username, output_dir):
+            try:
+                RUN_INDEX.add_run(results)
+            except sqlite3.Error as e:
+                print_status(f"Error updating the results index: {e}", "warning")
+    
+    return report_file
+
+def read_usernames(source):
+    """Read usernames from a file, or stdin when source is "-"
+
+    Blank lines and lines starting with # are ignored, and duplicates are
+    dropped while keeping the original order.
+    """
+    handle = sys.stdin if source == "-" else open(source, "r")
+    usernames = []
+    seen = set()
+    try:
+        for line in handle:
+            name = line.strip()
+            if not name or name.startswith("#") or name in seen:
+                continue
+            seen.add(name)
+            usernames.append(name)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return usernames
+
+COLLECTORS = {
+    "sherlock": run_sherlock,
+    "social_analyzer": run_social_analyzer,
+    "twitter": run_twint,
+    "instagram": run_instaloader
+}
+
+def investigate(username, search_dir, args, resume=False):
+    """Run the selected collectors for one username and generate its reports
+
+    With ``resume`` the stage manifest in ``search_dir`` is consulted and only
+    stages that failed, never ran or whose outputs changed are executed.
+    Reports are regenerated only when a stage ran or they are out of date.
+    """
     ensure_dir(search_dir)
+    manifest = StageManifest(search_dir, username)
     
-    print_status(f"Starting OSINT gathering for username: {args.username}")
+    print_status(f"Starting OSINT gathering for username: {username}")
     print_status(f"Results will be saved to: {search_dir}")
     
     # Always run Sherlock and Social-Analyzer
-    sherlock_success = run_sherlock(args.username, search_dir)
-    social_analyzer_success = run_social_analyzer(args.username, search_dir)
+    names = ["sherlock", "social_analyzer"]
     
     # Run platform-specific tools if requested
-    twitter_success = False
-    instagram_success = False
-    
     if args.twitter or args.all:
-        twitter_success = run_twint(args.username, search_dir)
+        names.append("twitter")
     
     if args.instagram or args.all:
-        instagram_success = run_instaloader(args.username, search_dir)
+        names.append("instagram")
+    
+    results = {}
+    if resume:
+        names += [name for name in manifest.stages if name in COLLECTORS and name not in names]
+        for name in names:
+            if manifest.is_complete(name):
+                print_status(f"Skipping {name}, already completed", "info")
+                results[name] = True
+        names = [name for name in names if name not in results]
+    
+    def record(name, success, duration):
+        outputs = [artifact.format(username=username) for artifact in COLLECTORS[name].artifacts]
+        manifest.record(name, success, duration, outputs)
+    
+    # The collectors are independent, so run them concurrently
+    stages = [(name, COLLECTORS[name], (username, search_dir)) for name in names]
+    results.update(run_stages(stages, args.jobs, on_finish=record))
+    
+    # Generate comprehensive report once all collectors have finished
+    if stages or not manifest.is_complete("reports"):
+        start = time.time()
+        report_args = (username, search_dir)
+        report_options = {"report_format": args.report_format, "visualize": not args.no_viz, "diff": args.diff}
+        if args.profile:
+            report_file = profiled(generate_report, os.path.join(search_dir, "postprocess.prof"),
+                                   *report_args, **report_options)
+        else:
+            report_file = generate_report(*report_args, **report_options)
+        manifest.record("reports", True, time.time() - start,
+                        [os.path.basename(report_file), f"{username}_report.html"])
+    else:
+        print_status("Reports are up to date", "info")
     
-    # Generate comprehensive report
-    report = generate_report(args.username, search_dir)
+    if METRICS is not None:
+        METRICS.write_textfile()
+    
+    return results
+
+def print_summary(username, search_dir, results, args):
+    """Print the summary for a single-username run"""
+    sherlock_success = results.get("sherlock", False)
+    social_analyzer_success = results.get("social_analyzer", False)
+    twitter_success = results.get("twitter", False)
+    instagram_success = results.get("instagram", False)
     
-    # Summary
     print("\n" + "="*50)
     print_status("OSINT Gathering Summary:", "success")
-    print_status(f"Username: {args.username}", "info")
+    print_status(f"Username: {username}", "info")
     print_status(f"Sherlock: {'Success' if sherlock_success else 'Failed'}", 
                 "success" if sherlock_success else "error")
     print_status(f"Social-Analyzer: {'Success' if social_analyzer_success else 'Failed'}", 
                 "success" if social_analyzer_success else "error")
     
-    if args.twitter or args.all:
+    if "twitter" in results:
         print_status(f"Twitter Analysis: {'Success' if twitter_success else 'Failed'}", 
                     "success" if twitter_success else "error")
     
-    if args.instagram or args.all:
+    if "instagram" in results:
         print_status(f"Instagram Analysis: {'Success' if instagram_success else 'Failed'}", 
                     "success" if instagram_success else "error")
     
+    if RESULT_CACHE is not None:
+        print_status(f"Cache: {RESULT_CACHE.hits} hits, {RESULT_CACHE.misses} misses", "info")
+    
     print_status(f"All results saved to: {search_dir}", "success")
-    print_status(f"HTML Report: {os.path.join(search_dir, f'{args.username}_report.html')}", "success")
+    print_status(f"HTML Report: {os.path.join(search_dir, f'{username}_report.html')}", "success")
     print("="*50)
 
-if __name__ == "__main__":
-    main()
-EOL
+def run_batch(usernames, results_root, args):
+    """Investigate many usernames in one process with a bounded worker pool
+
+    Each target gets its own directory under ``results_root`` and a batch
+    summary is written next to them once every target has finished.
+    """
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    summary = {
+        "started": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "workers": args.workers,
+        "targets": {}
+    }
+    
+    def process(username):
+        search_dir = results_root / f"{username}_{stamp}"
+        start = time.time()
+        results = investigate(username, search_dir, args)
+        return {
+            "search_dir": str(search_dir),
+            "duration": round(time.time() - start, 2),
+            "stages": results
+        }
+    
+    print_status(f"Starting batch of {len(usernames)} usernames with {args.workers} workers")
+    batch_start = time.time()
+    
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(process, username): username for username in usernames}
+        for done, future in enumerate(as_completed(futures), 1):
+            username = futures[future]
+            try:
+                summary["targets"][username] = future.result()
+                print_status(f"[{done}/{len(usernames)}] Finished {username}", "success")
+            except Exception as e:
+                summary["targets"][username] = {"error": str(e)}
+                print_status(f"[{done}/{len(usernames)}] {username} failed: {e}", "error")
+    
+    if RESULT_CACHE is not None:
+        summary["cache"] = {"hits": RESULT_CACHE.hits, "misses": RESULT_CACHE.misses}
+    throttled = {backend: {"throttles": limiter.throttles, "rate": round(limiter.rate, 4)}
+                 for backend, limiter in sorted(RATE_LIMITERS.items()) if limiter.throttles}
+    if throttled:
+        summary["throttled"] = throttled
+    
+    summary["finished"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    summary["duration"] = round(time.time() - batch_start, 2)
+    summary["failed"] = sorted(
+        username for username, target in summary["targets"].items()
+        if "error" in target or not all(target["stages"].values())
+    )
+    
+    summary_file = results_root / f"batch_{stamp}_summary.json"
+    with open(summary_file, "w") as f:
+        json.dump(summary, f, indent=4)
+    
+    print("\n" + "="*50)
+    print_status("Batch Summary:", "success")
+    print_status(f"Targets: {len(usernames)}", "info")
+    print_status(f"Targets with failures: {len(summary['failed'])}",
+                "warning" if summary["failed"] else "success")
+    print_status(f"Duration: {summary['duration']}s", "info")
+    if RESULT_CACHE is not None:
+        print_status(f"Cache: {RESULT_CACHE.hits} hits, {RESULT_CACHE.misses} misses", "info")
+    print_status(f"Batch summary saved to: {summary_file}", "success")
+    print("="*50)
+    
+    return summary
+
+def tweets_command(argv):
+    """``tweets`` subcommand: query or export the tweet store of a search directory"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} tweets",
+                                     description="Query the tweets collected in a search directory")
+    parser.add_argument("search_dir", help="Search directory of an earlier run")
+    parser.add_argument("--username", help="Target username (default: read from the manifest)")
+    parser.add_argument("--since", help="Only tweets at or after this date (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--until", help="Only tweets before this date (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--count", action="store_true", help="Print the number of matching tweets only")
+    parser.add_argument("--output", help="Export the matching tweets as line-delimited JSON to this file "
+                                         "(default: stdout)")
+    args = parser.parse_args(argv)
+    
+    username = args.username
+    if not username and (Path(args.search_dir) / MANIFEST_NAME).exists():
+        username = StageManifest(args.search_dir).username
+    if not username:
+        parser.error(f"no {MANIFEST_NAME} in {args.search_dir}, pass --username")
+    
+    store = OSINTResults(username, args.search_dir).store
+    if store is None:
+        parser.error(f"no tweets collected for {username} in {args.search_dir}")
+    
+    if args.count:
+        print(store.count_tweets(username, args.since, args.until))
+    elif args.output:
+        with open(args.output, "w") as f:
+            count = store.export_tweets(username, f, args.since, args.until)
+        print_status(f"Exported {count} tweets to {args.output}", "success")
+    else:
+        store.export_tweets(username, sys.stdout, args.since, args.until)
+
+def query_command(argv):
+    """``query`` subcommand: search the findings of all indexed runs"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} query",
+                                     description="Search the findings of earlier runs")
+    parser.add_argument("--index", default=str(RESULTS_DIR / INDEX_NAME),
+                        help=f"Index database (default: results/{INDEX_NAME})")
+    parser.add_argument("--status", action="append",
+                        help="Status to match, may be repeated (default: Claimed and Detected)")
+    subparsers = parser.add_subparsers(dest="query", required=True)
+    platform_parser = subparsers.add_parser("platform", help="Usernames found on a platform")
+    platform_parser.add_argument("platform")
+    shared_parser = subparsers.add_parser("shared", help="Platforms on which both usernames were found")
+    shared_parser.add_argument("first")
+    shared_parser.add_argument("second")
+    user_parser = subparsers.add_parser("user", help="Platforms a username was found on")
+    user_parser.add_argument("username")
+    runs_parser = subparsers.add_parser("runs", help="Indexed runs of a username")
+    runs_parser.add_argument("username")
+    rebuild_parser = subparsers.add_parser("rebuild", help="Re-index every search directory under a results root")
+    rebuild_parser.add_argument("results_root", nargs="?", default=str(RESULTS_DIR))
+    args = parser.parse_args(argv)
+    
+    if args.query != "rebuild" and not os.path.exists(args.index):
+        parser.error(f"no index at {args.index}, run a search or 'query rebuild' first")
+    # The index may be on a shared filesystem (worker mode), so leave its journal mode alone
+    index = RunIndex(args.index, shared=None)
+    statuses = tuple(args.status or FOUND_STATUSES)
+    try:
+        if args.query == "platform":
+            rows = index.usernames_on(args.platform, statuses)
+        elif args.query == "shared":
+            rows = index.shared_platforms(args.first, args.second, statuses)
+        elif args.query == "user":
+            rows = index.user_findings(args.username, statuses)
+        elif args.query == "runs":
+            rows = index.runs(args.username)
+        else:
+            count = index.rebuild(args.results_root)
+            print_status(f"Indexed {count} runs from {args.results_root}", "success")
+            return
+        for row in rows:
+            print("\t".join("" if value is None else str(value) for value in row))
+    finally:
+        index.close()
+
+def diff_command(argv):
+    """``diff`` subcommand: report what changed between runs"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} diff",
+                                     description="Report what changed between two runs of a username, or "
+                                                 "between the last two runs of many usernames")
+    parser.add_argument("search_dirs", nargs="*", metavar="DIR",
+                        help="Two search directories of the same username, older first")
+    parser.add_argument("--username", action="append", default=[],
+                        help="Compare the last two indexed runs of this username, may be repeated")
+    parser.add_argument("--usernames-file", help="File with one username per line ('-' reads from stdin)")
+    parser.add_argument("--all", action="store_true", help="Compare the last two runs of every indexed username")
+    parser.add_argument("--index", default=str(RESULTS_DIR / INDEX_NAME),
+                        help=f"Index database (default: results/{INDEX_NAME})")
+    parser.add_argument("--output", help="Write the change report(s) here instead of standard output")
+    parser.add_argument("--include-unchanged", action="store_true",
+                        help="Also list usernames without changes when comparing many")
+    args = parser.parse_args(argv)
+    
+    if args.search_dirs:
+        if len(args.search_dirs) != 2:
+            parser.error("give exactly two search directories")
+        usernames = {StageManifest(search_dir).username for search_dir in args.search_dirs}
+        if len(usernames) != 1 or None in usernames:
+            parser.error("both search directories must be runs of the same username")
+    elif not (args.username or args.usernames_file or args.all):
+        parser.error("give two search directories, --username, --usernames-file or --all")
+    elif not os.path.exists(args.index):
+        parser.error(f"no index at {args.index}, run a search or 'query rebuild' first")
+    
+    handle = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.search_dirs:
+            username = usernames.pop()
+            report = diff_runs(*(ensure_fingerprint(username, search_dir) for search_dir in args.search_dirs))
+            json.dump(report, handle, indent=2)
+            handle.write("\n")
+            return
+        
+        wanted = set(args.username + (read_usernames(args.usernames_file) if args.usernames_file else []))
+        index = RunIndex(args.index)
+        compared = changed = 0
+        try:
+            # One report per line, so large watchlists can be streamed and grepped
+            for username, search_dirs in index.latest_runs():
+                if len(search_dirs) < 2 or not (args.all or username in wanted):
+                    continue
+                try:
+                    report = diff_runs(*(ensure_fingerprint(username, search_dir)
+                                         for search_dir in reversed(search_dirs)))
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    print_status(f"Cannot compare runs of {username}: {e}", "warning")
+                    continue
+                compared += 1
+                if report["changes"]:
+                    changed += 1
+                if report["changes"] or args.include_unchanged:
+                    handle.write(json.dumps(report, separators=(",", ":")) + "\n")
+        finally:
+            index.close()
+        if args.output:
+            print_status(f"{changed} of {compared} usernames changed since their previous run", "success")
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+
+JOB_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    submitted TEXT NOT NULL,
+    started TEXT,
+    finished TEXT,
+    search_dir TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id);
+"""
+
+# Columns added for leases and batches, migrated into older queue files
+JOB_QUEUE_COLUMNS = {
+    "batch": "TEXT",
+    "worker": "TEXT",
+    "lease_expires": "REAL",
+    "attempts": "INTEGER NOT NULL DEFAULT 0"
+}
+
+# Per-job options accepted by the serve API, with their types
+JOB_OPTIONS = {"twitter": bool, "instagram": bool, "all": bool, "no_viz": bool, "report_format": str}
+
+# Usernames end up in file names, so the API only accepts plain ones
+USERNAME_PATTERN = re.compile(r"[\w][\w.-]{0,99}")
+
+# A job whose lease expired this many times (its worker keeps dying) is failed
+MAX_JOB_ATTEMPTS = 3
+JOB_LEASE_SECONDS = 300
+QUEUE_POLL_INTERVAL = 2
+
+class JobQueue:
+    """Persistent FIFO of investigations, shared by ``serve`` and distributed workers
+
+    Jobs move from "queued" to "running" to "done" (or "error") in a SQLite
+    database. A claimed job is leased to one worker until ``lease_expires``;
+    the worker extends the lease with heartbeat() while it runs, and a job
+    whose lease ran out is handed to the next worker that asks. Lease times
+    are wall-clock, so nodes sharing a queue need synchronised clocks.
+    
+    With ``shared`` the database uses a rollback journal instead of WAL,
+    which needs shared memory and does not work on network filesystems.
+    Other brokers can be registered in QUEUE_BACKENDS; they need the same
+    public methods.
+    """
+    
+    def __init__(self, db_file, shared=False):
+        self.db_file = str(db_file)
+        self.conn = sqlite3.connect(self.db_file, timeout=60, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+        self.conn.executescript(JOB_QUEUE_SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        with self.conn:
+            for name, definition in JOB_QUEUE_COLUMNS.items():
+                if name not in columns:
+                    self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_by_batch ON jobs (batch, status)")
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+    
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+    
+    def submit(self, username, options, batch=None):
+        return self.get(self.submit_many([username], options, batch)[0])
+    
+    def submit_many(self, usernames, options, batch=None):
+        """Queue one job per username in a single transaction, returning their ids"""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        encoded = json.dumps(options)
+        with self._available, self.conn:
+            ids = [self.conn.execute("INSERT INTO jobs (username, options, status, submitted, batch) "
+                                     "VALUES (?, ?, 'queued', ?, ?)",
+                                     (username, encoded, now, batch)).lastrowid for username in usernames]
+            self._available.notify(len(ids))
+        return ids
+    
+    def requeue_running(self):
+        """Queue jobs left running by a crashed single-node daemon again"""
+        with self._lock, self.conn:
+            return self.conn.execute("UPDATE jobs SET status = 'queued', started = NULL, worker = NULL, "
+                                     "lease_expires = NULL WHERE status = 'running'").rowcount
+    
+    def _claim_next(self, worker, lease):
+        now = time.time()
+        with self.conn:
+            # Take the write lock up front so two nodes cannot claim the same row
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute("UPDATE jobs SET status = 'error', finished = ?, error = ? WHERE status = 'running' "
+                              "AND lease_expires < ? AND attempts >= ?",
+                              (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                               f"lease expired {MAX_JOB_ATTEMPTS} times", now, MAX_JOB_ATTEMPTS))
+            row = self.conn.execute("SELECT id FROM jobs WHERE status = 'queued' "
+                                    "OR (status = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1",
+                                    (now,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE jobs SET status = 'running', started = ?, worker = ?, lease_expires = ?, "
+                              "attempts = attempts + 1 WHERE id = ?",
+                              (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), worker, now + lease, row["id"]))
+        return row["id"]
+    
+    def claim(self, worker, lease=JOB_LEASE_SECONDS, timeout=None):
+        """Lease the oldest available job to ``worker``, None on timeout
+
+        Local submissions wake the caller at once; jobs queued by other
+        processes are picked up by polling every QUEUE_POLL_INTERVAL seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                job_id = self._claim_next(worker, lease)
+                if job_id is not None:
+                    break
+                wait = QUEUE_POLL_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return None
+                self._available.wait(wait)
+        return self.get(job_id)
+    
+    def heartbeat(self, job_id, worker, lease=JOB_LEASE_SECONDS):
+        """Extend a lease, returning False if the job was handed to someone else"""
+        with self._lock, self.conn:
+            return self.conn.execute("UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? "
+                                     "AND status = 'running'", (time.time() + lease, job_id, worker)).rowcount > 0
+    
+    def finish(self, job_id, worker, status, search_dir, result=None, error=None):
+        """Record a job's outcome, unless its lease was lost in the meantime"""
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "UPDATE jobs SET status = ?, finished = ?, search_dir = ?, result = ?, error = ?, "
+                "lease_expires = NULL WHERE id = ? AND worker = ? AND status = 'running'",
+                (status, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), str(search_dir) if search_dir else None,
+                 json.dumps(result), error, job_id, worker)).rowcount > 0
+    
+    def get(self, job_id):
+        with self._lock:
+            return self._job(self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+    
+    def list(self, status=None, limit=100, batch=None):
+        filters = {"status": status, "batch": batch}
+        where = " AND ".join(f"{column} = ?" for column, value in filters.items() if value)
+        query = "SELECT * FROM jobs" + (f" WHERE {where}" if where else "") + " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self.conn.execute(query, [value for value in filters.values() if value] + [limit]).fetchall()
+        return [self._job(row) for row in rows]
+    
+    def counts(self, batch=None):
+        query = "SELECT status, COUNT(*) FROM jobs" + (" WHERE batch = ?" if batch else "") + " GROUP BY status"
+        with self._lock:
+            return dict(self.conn.execute(query, (batch,) if batch else ()).fetchall())
+
+# Queue brokers by URL scheme; a bare path is a SQLite file
+QUEUE_BACKENDS = {"sqlite": JobQueue}
+
+def open_queue(location, shared=False):
+    """Open the job queue at ``location``, e.g. ``/mnt/osint/jobs.db`` or ``sqlite:///mnt/osint/jobs.db``"""
+    scheme, separator, rest = str(location).partition("://")
+    if not separator:
+        scheme, rest = "sqlite", str(location)
+    if scheme not in QUEUE_BACKENDS:
+        raise ValueError(f"unknown queue backend {scheme!r}, expected one of {', '.join(QUEUE_BACKENDS)}")
+    return QUEUE_BACKENDS[scheme](rest, shared=shared)
 
-# Make the script executable
-chmod +x social_media_osint.py
+def report_paths(username, search_dir):
+    """Report files of a finished investigation that exist on disk"""
+    names = {
+        "report": f"{username}_comprehensive_report.json",
+        "report_ndjson": f"{username}_comprehensive_report.ndjson",
+        "html_report": f"{username}_report.html",
+        "visualizations": "visualizations"
+    }
+    return {key: str(Path(search_dir) / name) for key, name in names.items()
+            if (Path(search_dir) / name).exists()}
+
+def run_job(job, args, results_root):
+    """Investigate one queued job with the worker's options plus the job's own"""
+    options = argparse.Namespace(**vars(args))
+    for key, value in job["options"].items():
+        setattr(options, key, value)
+    search_dir = results_root / f"{job['username']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_job{job['id']}"
+    stages = investigate(job["username"], search_dir, options)
+    return search_dir, {"stages": stages, "failed_stages": sorted(name for name, ok in stages.items() if not ok),
+                        **report_paths(job["username"], search_dir)}
 
-echo "[+] Installation complete!"
-echo "[+] To run the tool, use: cd ~/social_osint && source venv/bin/activate && python social_media_osint.py <username>"
+def queue_worker(queue, args, stop, results_root, name, lease=JOB_LEASE_SECONDS):
+    """Claim and run jobs until ``stop`` is set, heartbeating while each one runs"""
+    while not stop.is_set():
+        job = queue.claim(name, lease, timeout=1)
+        if job is None:
+            continue
+        print_status(f"Job {job['id']}: investigating {job['username']}")
+        
+        running = threading.Event()
+        def heartbeat():
+            while not running.wait(lease / 3):
+                if not queue.heartbeat(job["id"], name, lease):
+                    print_status(f"Job {job['id']}: lease lost, another worker will redo it", "warning")
+                    return
+        beating = threading.Thread(target=heartbeat, name=f"{name}-heartbeat", daemon=True)
+        beating.start()
+        
+        search_dir = None
+        try:
+            search_dir, result = run_job(job, args, results_root)
+            if queue.finish(job["id"], name, "done", search_dir, result):
+                print_status(f"Job {job['id']}: finished {job['username']}", "success")
+        except Exception as e:
+            queue.finish(job["id"], name, "error", search_dir, error=str(e))
+            print_status(f"Job {job['id']}: {job['username']} failed: {e}", "error")
+        finally:
+            running.set()
+            beating.join()
+
+def parse_job_request(body):
+    """Validate a POST /jobs body, returning ``(usernames, options)``"""
+    request = json.loads(body or b"{}")
+    if not isinstance(request, dict):
+        raise ValueError("expected a JSON object")
+    usernames = request.get("usernames") or ([request["username"]] if request.get("username") else [])
+    if not usernames or not isinstance(usernames, list):
+        raise ValueError("'username' or a non-empty 'usernames' list is required")
+    for username in usernames:
+        if not isinstance(username, str) or not USERNAME_PATTERN.fullmatch(username):
+            raise ValueError(f"invalid username {username!r}")
+    
+    options = {}
+    for key, kind in JOB_OPTIONS.items():
+        if key in request:
+            if not isinstance(request[key], kind):
+                raise ValueError(f"'{key}' must be a {kind.__name__}")
+            options[key] = request[key]
+    if options.get("report_format", "pretty") not in REPORT_FORMATS:
+        raise ValueError(f"'report_format' must be one of {', '.join(REPORT_FORMATS)}")
+    return usernames, options
+
+class JobAPIHandler(BaseHTTPRequestHandler):
+    """Local HTTP/JSON API of the ``serve`` daemon
+
+    POST /jobs         {"usernames": [...], "twitter": true, ...} queues one job per username
+    GET  /jobs         recent jobs, optionally ?status=queued&limit=50
+    GET  /jobs/<id>    one job, with report paths once it is done
+    GET  /health       queue counts and worker count
+    """
+    
+    server_version = "social-osint"
+    
+    def send_json(self, status, data):
+        body = json.dumps(data, indent=2).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        queue = self.server.queue
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["health"]:
+            self.send_json(HTTPStatus.OK, {"status": "ok", "workers": self.server.workers, "jobs": queue.counts()})
+        elif parts == ["jobs"]:
+            query = dict(pair.partition("=")[::2] for pair in url.query.split("&") if pair)
+            try:
+                limit = max(1, min(1000, int(query.get("limit", 100))))
+            except ValueError:
+                self.send_json(HTTPStatus.BAD_REQUEST, {"error": "'limit' must be a number"})
+                return
+            self.send_json(HTTPStatus.OK, {"jobs": queue.list(query.get("status"), limit)})
+        elif len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+            job = queue.get(int(parts[1]))
+            if job is None:
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": f"no job {parts[1]}"})
+            else:
+                self.send_json(HTTPStatus.OK, job)
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
+    
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip("/") != "/jobs":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            usernames, options = parse_job_request(self.rfile.read(length))
+        except ValueError as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        queue = self.server.queue
+        jobs = [queue.get(job_id) for job_id in queue.submit_many(usernames, options)]
+        self.send_json(HTTPStatus.ACCEPTED, {"jobs": jobs})
+    
+    def log_message(self, format, *args):
+        # Hundreds of status polls an hour would drown the investigation output
+        pass
+
+def warm_up():
+    """Import the report libraries, run in each render worker at startup"""
+    import pandas
+    import seaborn
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+def warm_start(args):
+    """Load the report libraries once so queued jobs do not pay for them"""
+    global RENDER_POOL
+    
+    if args.no_viz:
+        return
+    warm_up()
+    if args.render_workers > 0:
+        RENDER_POOL = start_render_pool(args.render_workers)
+        for _ in range(args.render_workers):
+            RENDER_POOL.submit(warm_up)
+
+def start_queue_workers(queue, args, results_root, prefix, lease=JOB_LEASE_SECONDS):
+    """Start ``args.workers`` queue_worker threads, returning their stop event and threads"""
+    stop = threading.Event()
+    workers = [threading.Thread(target=queue_worker, args=(queue, args, stop, results_root, f"{prefix}-{i}", lease),
+                                name=f"job-worker-{i}")
+               for i in range(max(1, args.workers))]
+    for worker in workers:
+        worker.start()
+    return stop, workers
+
+def join_queue_workers(stop, workers):
+    stop.set()
+    print_status("Shutting down, waiting for running jobs (interrupt again to abandon them)", "warning")
+    try:
+        for worker in workers:
+            worker.join()
+    finally:
+        if RENDER_POOL is not None:
+            RENDER_POOL.shutdown(cancel_futures=True)
+
+def serve_command(argv):
+    """``serve`` subcommand: run investigations submitted over a local HTTP API"""
+    parser = build_parser(f"{os.path.basename(sys.argv[0])} serve",
+                          "Run investigations submitted over a local HTTP/JSON API", targets=False)
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address to listen on; the API has no authentication (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--queue", default=str(RESULTS_DIR / "jobs.db"),
+                        help="Persistent job queue (default: results/jobs.db)")
+    args = parser.parse_args(argv)
+    args.resume = False
+    
+    if not args.no_banner:
+        print_banner()
+    configure(args, parser)
+    warm_start(args)
+    
+    queue = open_queue(args.queue)
+    requeued = queue.requeue_running()
+    if requeued:
+        print_status(f"Re-queued {requeued} jobs interrupted by the last shutdown", "warning")
+    
+    server = ThreadingHTTPServer((args.host, args.port), JobAPIHandler)
+    server.queue = queue
+    server.workers = max(1, args.workers)
+    stop, workers = start_queue_workers(queue, args, RESULTS_DIR, f"serve-{os.getpid()}")
+    
+    # serve_forever() runs on this thread, so shut it down from another one
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print_status(f"Serving on http://{args.host}:{server.server_address[1]} with {server.workers} workers",
+                 "success")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        join_queue_workers(stop, workers)
+
+def coordinator_command(argv):
+    """``coordinator`` subcommand: split a username list into jobs on a shared queue"""
+    parser = argparse.ArgumentParser(prog=f"{os.path.basename(sys.argv[0])} coordinator",
+                                     description="Queue usernames for workers on other nodes")
+    parser.add_argument("queue", help="Shared job queue, a SQLite file on a shared filesystem or a broker URL")
+    parser.add_argument("usernames", nargs="*", help="Usernames to queue")
+    parser.add_argument("--usernames-file", help="File with one username per line ('-' reads from stdin)")
+    parser.add_argument("--batch", default=datetime.now().strftime("%Y%m%d_%H%M%S"),
+                        help="Name for this set of jobs (default: current time)")
+    parser.add_argument("--twitter", action="store_true", help="Run Twitter analysis")
+    parser.add_argument("--instagram", action="store_true", help="Run Instagram analysis")
+    parser.add_argument("--all", action="store_true", help="Run all available tools")
+    parser.add_argument("--no-viz", action="store_true", help="Skip generating visualizations")
+    parser.add_argument("--report-format", choices=REPORT_FORMATS, default="pretty",
+                        help="Comprehensive report layout (default: pretty)")
+    parser.add_argument("--wait", action="store_true", help="Follow the batch until every job has finished")
+    args = parser.parse_args(argv)
+    
+    usernames = list(dict.fromkeys(args.usernames + (read_usernames(args.usernames_file)
+                                                     if args.usernames_file else [])))
+    invalid = [username for username in usernames if not USERNAME_PATTERN.fullmatch(username)]
+    for username in invalid:
+        print_status(f"Skipping invalid username {username!r}", "warning")
+    usernames = [username for username in usernames if username not in invalid]
+    if not usernames:
+        parser.error("no usernames to queue")
+    
+    try:
+        queue = open_queue(args.queue, shared=True)
+    except ValueError as e:
+        parser.error(str(e))
+    options = {key: getattr(args, key) for key in JOB_OPTIONS}
+    queue.submit_many(usernames, options, args.batch)
+    print_status(f"Queued {len(usernames)} jobs as batch {args.batch} on {args.queue}", "success")
+    
+    if not args.wait:
+        return
+    last = None
+    while True:
+        counts = queue.counts(args.batch)
+        if counts != last:
+            print_status("Batch " + args.batch + ": " + ", ".join(f"{count} {status}"
+                                                                   for status, count in sorted(counts.items())))
+            last = counts
+        if not counts.get("queued") and not counts.get("running"):
+            break
+        time.sleep(QUEUE_POLL_INTERVAL)
+    
+    failed = queue.list("error", len(usernames), args.batch)
+    for job in failed:
+        print_status(f"Job {job['id']} ({job['username']}) failed: {job['error']}", "error")
+    if failed:
+        sys.exit(1)
+
+def worker_command(argv):
+    """``worker`` subcommand: run jobs from a shared queue until stopped"""
+    parser = build_parser(f"{os.path.basename(sys.argv[0])} worker",
+                          "Run investigations from a shared job queue", targets=False)
+    parser.add_argument("queue", help="Shared job queue, a SQLite file on a shared filesystem or a broker URL")
+    parser.add_argument("--results-root", default=str(RESULTS_DIR),
+                        help="Where search directories, the run index, result cache, Twitter archive and "
+                             "metrics logs are written, normally on the shared filesystem (default: results)")
+    parser.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Worker name recorded on leased jobs (default: HOST-PID)")
+    parser.add_argument("--lease", type=int, default=JOB_LEASE_SECONDS,
+                        help=f"Seconds a job stays leased without a heartbeat before it is handed to another "
+                             f"worker (default: {JOB_LEASE_SECONDS})")
+    parser.add_argument("--exit-when-empty", action="store_true",
+                        help="Exit once no job is queued or running instead of waiting for more")
+    args = parser.parse_args(argv)
+    args.resume = False
+    
+    if not args.no_banner:
+        print_banner()
+    results_root = Path(args.results_root).resolve()
+    # Keep what the nodes share under the shared root instead of each node's
+    # own results directory. Each worker appends to its own metrics log, as
+    # appends from several hosts can interleave on network filesystems; the
+    # Prometheus textfile stays local for the node's collector.
+    for option, name in (("twitter_archive", "twitter_archive.db"), ("metrics_log", f"metrics-{args.name}.jsonl")):
+        if getattr(args, option) == parser.get_default(option):
+            setattr(args, option, str(results_root / name))
+    configure(args, parser, results_root, shared=True)
+    try:
+        queue = open_queue(args.queue, shared=True)
+    except ValueError as e:
+        parser.error(str(e))
+    warm_start(args)
+    
+    stop, workers = start_queue_workers(queue, args, results_root, args.name, max(30, args.lease))
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    print_status(f"Worker {args.name} running {len(workers)} jobs at a time from {args.queue}", "success")
+    try:
+        while not stop.wait(QUEUE_POLL_INTERVAL):
+            counts = queue.counts()
+            if args.exit_when_empty and not counts.get("queued") and not counts.get("running"):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        join_queue_workers(stop, workers)
+
+def variants_command(argv):
+    """``variants`` subcommand: check spelling variants of a username in one presence pass"""
+    parser = build_parser(f"{os.path.basename(sys.argv[0])} variants",
+                          "Check separator, digit and leetspeak variants of a username", targets=False)
+    parser.add_argument("username", help="Username to expand")
+    parser.add_argument("--max-variants", type=int, default=500,
+                        help="Check at most this many candidates, the likeliest first (default: 500)")
+    parser.add_argument("--no-separators", action="store_true", help="Do not rejoin words with . _ -")
+    parser.add_argument("--no-digits", action="store_true", help="Do not try common digit suffixes")
+    parser.add_argument("--no-leet", action="store_true", help="Do not try leetspeak spellings")
+    parser.add_argument("--list", action="store_true", help="Print the candidates without checking them")
+    parser.add_argument("--output-dir", help="Where to write results (default: results/USERNAME_variants_TIME)")
+    parser.add_argument("--negative-ttl", type=int, default=7 * 86400,
+                        help="Skip sites a candidate was absent from within this many seconds (default: 604800)")
+    parser.add_argument("--recheck", action="store_true",
+                        help="Probe every site even if it is remembered as absent")
+    args = parser.parse_args(argv)
+    
+    candidates = expand_username(args.username, not args.no_separators, not args.no_digits, not args.no_leet,
+                                 args.max_variants)
+    if args.list:
+        print("\n".join(candidates))
+        return
+    
+    if not args.no_banner:
+        print_banner()
+    configure(args, parser)
+    sites_file = find_site_manifest()
+    if sites_file is None:
+        parser.error("variant checks use the built-in engine and need a site manifest, see --sites")
+    
+    search_dir = Path(args.output_dir).resolve() if args.output_dir else \
+        RESULTS_DIR / f"{args.username}_variants_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    ensure_dir(search_dir)
+    summary_file = search_dir / f"{args.username}_variants.json"
+    
+    sites = load_site_manifest(sites_file)
+    negatives = NegativeCache(CACHE_DIR / "presence_negatives.bloom", ttl=args.negative_ttl)
+    skip = None if args.recheck else lambda site, username: (site, username) in negatives
+    print_status(f"Checking {len(candidates)} variants of {args.username} on {len(sites)} sites...")
+    
+    with instrument("variants", args.username, search_dir, [summary_file]):
+        checker = PresenceChecker(sites, timeout=PRESENCE_OPTIONS["timeout"],
+                                  max_connections=PRESENCE_OPTIONS["max_connections"],
+                                  per_host=PRESENCE_OPTIONS["per_host"])
+        results = checker.check(candidates, skip)
+        
+        summary = {}
+        skipped = 0
+        for candidate, checked in results.items():
+            claimed = {name: site["url"] for name, site in checked.items() if site["status"] == "Claimed"}
+            for name, site in checked.items():
+                if site.get("cached"):
+                    skipped += 1
+                elif site["status"] == "Available":
+                    negatives.add(name, candidate)
+            if claimed:
+                write_presence_results(candidate, search_dir, checked)
+            summary[candidate] = {"claimed": claimed, "errors": sum(1 for site in checked.values() if "error" in site)}
+        negatives.save()
+        
+        with open(summary_file, "w") as f:
+            json.dump({"username": args.username, "generated": datetime.now().isoformat(),
+                       "sites": len(sites), "probed": len(candidates) * len(sites) - skipped,
+                       "skipped_known_absent": skipped, "variants": summary}, f, indent=2)
+    
+    found = sorted(((len(info["claimed"]), candidate) for candidate, info in summary.items() if info["claimed"]),
+                   reverse=True)
+    print_status(f"Skipped {skipped} of {len(candidates) * len(sites)} checks as known absent, "
+                 f"remembered {negatives.added} new misses", "info")
+    print_status(f"{len(found)} of {len(candidates)} variants have accounts", "success")
+    for count, candidate in found[:20]:
+        print(f"  {candidate}: {count} sites")
+    print_status(f"Variant results saved to {summary_file}", "success")
+
+# Subcommands take precedence over the username positional, see main()
+SUBCOMMANDS = {
+    "tweets": tweets_command,
+    "query": query_command,
+    "diff": diff_command,
+    "serve": serve_command,
+    "coordinator": coordinator_command,
+    "worker": worker_command,
+    "variants": variants_command
+}
+
+def build_parser(prog=None, description="Social Media OSINT Framework for Kali Linux", targets=True):
+    """Command line options shared by a normal run and ``serve``
+
+    ``targets`` adds the options that pick what to investigate, which the
+    daemon takes from its API instead.
+    """
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    if targets:
+        parser.add_argument("username", nargs="?", help="Username to search for")
+        parser.add_argument("--resume", metavar="DIR",
+                            help="Re-run only the failed or missing stages of an earlier search directory")
+        parser.add_argument("--usernames-file",
+                            help="File with one username per line ('-' reads from stdin) for batch mode")
+        parser.add_argument("--output-dir", help="Custom output directory (results root in batch mode)")
+    parser.add_argument("--no-banner", action="store_true", help="Do not print the startup banner")
+    parser.add_argument("--twitter", action="store_true", help="Run Twitter analysis")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch tweets newer than the last run, merge them into the Twitter archive "
+                             "and report follower changes")
+    parser.add_argument("--twitter-archive", default=str(RESULTS_DIR / "twitter_archive.db"),
+                        help="Tweet and follower archive used by --incremental "
+                             "(default: results/twitter_archive.db)")
+    parser.add_argument("--instagram", action="store_true", help="Run Instagram analysis")
+    parser.add_argument("--all", action="store_true", help="Run all available tools")
+    parser.add_argument("--report-format", choices=REPORT_FORMATS, default="pretty",
+                        help="Layout of the comprehensive report (default: pretty)")
+    parser.add_argument("--no-viz", action="store_true",
+                        help="Skip chart generation (avoids loading pandas/matplotlib/seaborn)")
+    parser.add_argument("--cache-ttl", type=int, default=86400,
+                        help="Reuse cached collector results younger than this many seconds (default: 86400)")
+    parser.add_argument("--cache-max-mb", type=int, default=1024,
+                        help="Evict least recently used cache entries above this size (default: 1024)")
+    parser.add_argument("--no-cache", action="store_true", help="Always run the collectors")
+    parser.add_argument("--stage-timeout", type=int,
+                        help="Kill any collector still running after this many seconds "
+                             "(default: per-tool, 10-30 minutes)")
+    parser.add_argument("--rate-limit", action="append", default=[], metavar="BACKEND=RATE[:BURST]",
+                        help="Requests per second (and burst) for a backend, shared by all targets: "
+                             f"{', '.join(RATE_LIMITS)} (may be repeated)")
+    parser.add_argument("--engine", choices=["native", "sherlock"], default="native",
+                        help="Username presence checker: built-in async engine or the Sherlock subprocess")
+    parser.add_argument("--sites", help="Site manifest for the built-in engine (default: Sherlock's data.json)")
+    parser.add_argument("--presence-connections", type=int, default=50,
+                        help="Maximum concurrent requests of the built-in engine (default: 50)")
+    parser.add_argument("--presence-per-host", type=int, default=4,
+                        help="Maximum concurrent requests per host (default: 4)")
+    parser.add_argument("--render-workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Processes rendering charts in batch mode, 0 renders in-process (default: up to 4)")
+    parser.add_argument("--html-page-size", type=int, default=HTML_PAGE_SIZE,
+                        help=f"Rows per HTML table page before splitting into sub-pages (default: {HTML_PAGE_SIZE})")
+    parser.add_argument("--jobs", type=int, default=4,
+                        help="Maximum number of collectors to run at the same time (default: 4)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Number of usernames processed at the same time in batch, serve and worker mode (default: 4)")
+    parser.add_argument("--metrics-log", default=str(RESULTS_DIR / "metrics.jsonl"),
+                        help="Append per-stage timings and resource usage here as JSON lines "
+                             "(default: results/metrics.jsonl)")
+    parser.add_argument("--metrics-textfile", default=str(RESULTS_DIR / "osint_metrics.prom"),
+                        help="Prometheus textfile-collector snapshot of the stage totals, "
+                             "'' disables it (default: results/osint_metrics.prom)")
+    parser.add_argument("--stage-peak-rss", action="store_true",
+                        help="Reset the peak RSS for each stage (Linux) so its metrics show the stage's own "
+                             "peak rather than the process's peak so far")
+    parser.add_argument("--diff", action="store_true",
+                        help="Compare the results with the previous run of the same username "
+                             "and write USERNAME_changes.json")
+    parser.add_argument("--no-index", action="store_true",
+                        help=f"Do not add the findings to the cross-run index (results/{INDEX_NAME})")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write cProfile output of the report generation to postprocess.prof "
+                             "in the search directory")
+    return parser
+
+def configure(args, parser, results_dir=None, shared=False):
+    """Apply the parsed options to the module-level settings
+
+    The run index and result cache live in ``results_dir`` (default:
+    RESULTS_DIR and CACHE_DIR as currently set); ``shared`` means
+    it is on a filesystem other nodes use too, so SQLite databases there use
+    a rollback journal instead of WAL.
+    """
+    global RESULT_CACHE, HTML_PAGE_SIZE, METRICS, RUN_INDEX, STAGE_PEAK_RSS
+    
+    results_dir = Path(results_dir) if results_dir is not None else None
+    # Create results directory
+    ensure_dir(results_dir or RESULTS_DIR)
+    
+    PRESENCE_OPTIONS.update({
+        "engine": args.engine,
+        "sites_file": args.sites,
+        "max_connections": args.presence_connections,
+        "per_host": args.presence_per_host
+    })
+    
+    for limit in args.rate_limit:
+        backend, _, value = limit.partition("=")
+        rate, _, burst = value.partition(":")
+        try:
+            RATE_LIMITS[backend] = {"rate": float(rate), "burst": float(burst or RATE_LIMITS[backend]["burst"])}
+        except (KeyError, ValueError):
+            parser.error(f"invalid --rate-limit {limit!r}, expected one of {', '.join(RATE_LIMITS)}=RATE[:BURST]")
+        if RATE_LIMITS[backend]["rate"] <= 0:
+            parser.error(f"--rate-limit {limit!r} must be positive")
+    
+    TWINT_OPTIONS.update({"incremental": args.incremental, "archive": args.twitter_archive,
+                          "shared_archive": shared})
+    
+    if args.stage_timeout:
+        STAGE_TIMEOUTS.update(dict.fromkeys(STAGE_TIMEOUTS, args.stage_timeout))
+    
+    HTML_PAGE_SIZE = max(1, args.html_page_size)
+    
+    METRICS = MetricsRecorder(args.metrics_log, args.metrics_textfile or None)
+    STAGE_PEAK_RSS = args.stage_peak_rss
+    
+    if not args.no_index:
+        RUN_INDEX = RunIndex((results_dir or RESULTS_DIR) / INDEX_NAME, shared=shared)
+    
+    if not args.no_cache:
+        cache_dir = CACHE_DIR if results_dir is None else results_dir / CACHE_DIR.name
+        RESULT_CACHE = ResultCache(cache_dir, ttl=args.cache_ttl,
+                                   max_bytes=args.cache_max_mb * 1024 * 1024)
+    
+
+def start_render_pool(workers):
+    """Process pool for chart rendering, see RENDER_POOL"""
+    # Workers are recycled periodically so memory stays flat in long batches
+    pool_options = {"max_workers": workers, "mp_context": multiprocessing.get_context("spawn")}
+    if sys.version_info >= (3, 11):
+        pool_options["max_tasks_per_child"] = 200
+    return ProcessPoolExecutor(**pool_options)
+
+def main():
+    global RENDER_POOL
+    
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+    
+    parser = build_parser()
+    args = parser.parse_args()
+    
+    if args.resume:
+        manifest_file = Path(args.resume) / MANIFEST_NAME
+        if not manifest_file.exists():
+            parser.error(f"no {MANIFEST_NAME} found in {args.resume}")
+        args.username = StageManifest(args.resume).username
+    
+    if not args.username and not args.usernames_file:
+        parser.error("a username or --usernames-file is required")
+    
+    if not args.no_banner:
+        print_banner()
+    
+    configure(args, parser)
+    
+    if args.usernames_file:
+        usernames = read_usernames(args.usernames_file)
+        if args.username and args.username not in usernames:
+            usernames.insert(0, args.username)
+        # Usernames become directory names under the results root, as in serve and coordinator
+        invalid = [username for username in usernames if not USERNAME_PATTERN.fullmatch(username)]
+        for username in invalid:
+            print_status(f"Skipping invalid username {username!r}", "warning")
+        usernames = [username for username in usernames if username not in invalid]
+        if not usernames:
+            parser.error("no valid usernames to investigate")
+        results_root = Path(args.output_dir).resolve() if args.output_dir else RESULTS_DIR
+        ensure_dir(results_root)
+        
+        if args.render_workers > 0 and not args.no_viz:
+            RENDER_POOL = start_render_pool(args.render_workers)
+        try:
+            run_batch(usernames, results_root, args)
+        finally:
+            if RENDER_POOL is not None:
+                RENDER_POOL.shutdown()
+        return
+    
+    # Create directory for this search
+    if args.resume:
+        search_dir = Path(args.resume).resolve()
+    elif args.output_dir:
+        search_dir = Path(args.output_dir).resolve()
+    else:
+        search_dir = RESULTS_DIR / f"{args.username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    
+    results = investigate(args.username, search_dir, args, resume=bool(args.resume))
+    print_summary(args.username, search_dir, results, args)
+
+if __name__ == "__main__":
+    main()
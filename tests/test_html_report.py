@@ -0,0 +1,51 @@
+"""generate_html_report with charts and a Twitter screen name that differs from the target
+
+Run with: python -m pytest tests  (or python -m unittest discover tests)
+"""
+
+import json
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import social_media_osint as osint
+
+TARGET = "JohnDoe"
+CHARTS = ["tweet_activity", "activity_heatmap", "engagement"]
+
+class HTMLReportChartsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.tmp.name)
+        with open(self.output_dir / f"{TARGET}_twitter_tweets.json", "w") as f:
+            for i in range(3):
+                f.write(json.dumps({"id": 100 + i, "user_id": 42, "username": "johndoe", "name": "John Doe",
+                                    "date": f"2026-01-0{i + 1}", "time": "10:00:00", "tweet": f"tweet {i}",
+                                    "likes_count": i, "retweets_count": 0, "replies_count": 0,
+                                    "hashtags": []}) + "\n")
+        viz_dir = self.output_dir / "visualizations"
+        viz_dir.mkdir()
+        # The charts are named after the target, as generate_visualizations() writes them
+        for chart in CHARTS:
+            (viz_dir / f"{TARGET}_{chart}.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_charts_are_embedded_under_target_name(self):
+        results = osint.OSINTResults(TARGET, self.output_dir)
+        self.assertEqual(results.twitter_profile.username, "johndoe")
+        osint.generate_html_report(TARGET, self.output_dir, results)
+
+        html = (self.output_dir / f"{TARGET}_report.html").read_text()
+        sources = re.findall(r'<img[^>]*src="([^"]+)"', html)
+        self.assertEqual(sorted(sources), sorted(f"visualizations/{TARGET}_{chart}.png" for chart in CHARTS))
+        # The profile still shows the screen name Twint reported
+        self.assertIn("johndoe", html)
+
+if __name__ == "__main__":
+    unittest.main()
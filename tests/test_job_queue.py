@@ -0,0 +1,69 @@
+"""JobQueue leases, with two queue handles on one database standing in for two nodes
+
+Run with: python -m pytest tests  (or python -m unittest discover tests)
+"""
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import social_media_osint as osint
+
+LEASE = 0.2
+
+class JobQueueLeaseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_file = Path(self.tmp.name) / "jobs.db"
+        self.first = osint.open_queue(db_file, shared=True)
+        self.second = osint.open_queue(f"sqlite://{db_file}", shared=True)
+
+    def tearDown(self):
+        self.first.conn.close()
+        self.second.conn.close()
+        self.tmp.cleanup()
+
+    def test_leased_job_is_not_handed_out_twice(self):
+        job = self.first.submit("alice", {})
+        self.assertEqual(self.first.claim("node-a", lease=60, timeout=0)["id"], job["id"])
+        self.assertIsNone(self.second.claim("node-b", lease=60, timeout=0))
+
+    def test_expired_lease_moves_job_to_another_worker(self):
+        job = self.first.submit("alice", {})
+        self.first.claim("node-a", lease=LEASE, timeout=0)
+        time.sleep(LEASE * 2)
+
+        claimed = self.second.claim("node-b", lease=60, timeout=0)
+        self.assertEqual(claimed["id"], job["id"])
+        self.assertEqual(claimed["worker"], "node-b")
+        self.assertEqual(claimed["attempts"], 2)
+        # The first worker finds out it lost the job and cannot overwrite the new owner's result
+        self.assertFalse(self.first.heartbeat(job["id"], "node-a", LEASE))
+        self.assertFalse(self.first.finish(job["id"], "node-a", "done", None))
+        self.assertTrue(self.second.finish(job["id"], "node-b", "done", None, {"ok": True}))
+        self.assertEqual(self.first.get(job["id"])["status"], "done")
+
+    def test_heartbeat_keeps_lease(self):
+        job = self.first.submit("alice", {})
+        self.first.claim("node-a", lease=LEASE, timeout=0)
+        for _ in range(4):
+            time.sleep(LEASE / 2)
+            self.assertTrue(self.first.heartbeat(job["id"], "node-a", LEASE))
+        self.assertIsNone(self.second.claim("node-b", lease=60, timeout=0))
+
+    def test_job_fails_after_too_many_expired_leases(self):
+        job = self.first.submit("alice", {})
+        for attempt in range(osint.MAX_JOB_ATTEMPTS):
+            self.assertEqual(self.first.claim(f"node-{attempt}", lease=LEASE, timeout=0)["id"], job["id"])
+            time.sleep(LEASE * 2)
+        self.assertIsNone(self.second.claim("node-b", lease=60, timeout=0))
+        failed = self.first.get(job["id"])
+        self.assertEqual(failed["status"], "error")
+        self.assertIn("lease expired", failed["error"])
+
+if __name__ == "__main__":
+    unittest.main()
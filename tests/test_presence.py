@@ -0,0 +1,191 @@
+"""PresenceChecker against a local http.server standing in for the sites
+
+Run with: python -m pytest tests  (or python -m unittest discover tests)
+"""
+
+import contextlib
+import http.server
+import json
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import social_media_osint as osint
+
+USERS = {"alice"}
+
+@contextlib.contextmanager
+def closed_port():
+    """A local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        yield sock.getsockname()[1]
+
+class SiteHandler(http.server.BaseHTTPRequestHandler):
+    """Fake sites, one per path prefix: /status, /message, /redirect, /login, /throttle and /limited"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=(), chunked=False):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        if chunked:
+            for start in range(0, len(body), 7):
+                chunk = body[start:start + 7]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path, self.client_address))
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+
+        _, site, *rest = self.path.split("/")
+        username = rest[0] if rest else ""
+        if site == "status":
+            self._send(200 if username in USERS else 404, b"profile")
+        elif site == "message":
+            text = f"<html><title>{username}</title>" + ("Profile of " if username in USERS else "No such user ")
+            self._send(200, (text + username + "</html>").encode(), chunked=True)
+        elif site == "redirect":
+            if username in USERS:
+                self._send(200, b"profile")
+            else:
+                self._send(302, headers=[("Location", "/login")])
+        elif site == "login":
+            self._send(200, b"please log in")
+        elif site == "throttle":
+            # Throttled once, then answers
+            if hits == 1:
+                self._send(429, headers=[("Retry-After", "0")])
+            else:
+                self._send(200 if username in USERS else 404)
+        elif site == "limited":
+            self._send(429, headers=[("Retry-After", "0")])
+        else:
+            self._send(404)
+
+    do_HEAD = do_GET
+
+class PresenceCheckerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests = []
+        self.server.hits = {}
+        # A fresh, fast limiter for the test host so throttling in one test does not slow the others
+        self.limits = dict(osint.RATE_LIMITS["presence_host"])
+        osint.RATE_LIMITS["presence_host"] = {"rate": 1000.0, "burst": 1000}
+        osint.RATE_LIMITERS.clear()
+
+    def tearDown(self):
+        osint.RATE_LIMITS["presence_host"] = self.limits
+        osint.RATE_LIMITERS.clear()
+
+    def check(self, sites, usernames=("alice", "bob"), **kwargs):
+        checker = osint.PresenceChecker(sites, timeout=5, **kwargs)
+        return checker.check(usernames)
+
+    def site(self, path, **options):
+        return {"url": f"{self.base}/{path}/{{}}", "urlMain": self.base, **options}
+
+    def test_status_code_uses_head(self):
+        results = self.check({"Status": self.site("status", errorType="status_code")})
+        self.assertEqual(results["alice"]["Status"]["status"], "Claimed")
+        self.assertEqual(results["bob"]["Status"]["status"], "Available")
+        self.assertEqual(results["bob"]["Status"]["http_status"], 404)
+        self.assertEqual({method for method, _, _ in self.server.requests}, {"HEAD"})
+
+    def test_message_reads_chunked_body(self):
+        results = self.check({"Message": self.site("message", errorType="message", errorMsg="No such user")})
+        self.assertEqual(results["alice"]["Message"]["status"], "Claimed")
+        self.assertEqual(results["bob"]["Message"]["status"], "Available")
+        self.assertEqual({method for method, _, _ in self.server.requests}, {"GET"})
+
+    def test_response_url_does_not_follow_redirects(self):
+        results = self.check({"Redirect": self.site("redirect", errorType="response_url")})
+        self.assertEqual(results["alice"]["Redirect"]["status"], "Claimed")
+        self.assertEqual(results["bob"]["Redirect"]["status"], "Available")
+        self.assertEqual(results["bob"]["Redirect"]["http_status"], 302)
+        self.assertNotIn("/login", [path for _, path, _ in self.server.requests])
+
+    def test_illegal_username_is_not_probed(self):
+        results = self.check({"Status": self.site("status", regexCheck="^[a-z]+$")}, usernames=["b.o.b"])
+        self.assertEqual(results["b.o.b"]["Status"]["status"], "Illegal")
+        self.assertEqual(self.server.requests, [])
+
+    def test_keep_alive_connections_are_reused(self):
+        usernames = [f"user{i}" for i in range(10)]
+        self.check({"Status": self.site("status"), "Message": self.site("message", errorType="message",
+                                                                        errorMsg="No such user")},
+                   usernames=usernames, per_host=1)
+        self.assertEqual(len(self.server.requests), 20)
+        # One connection per host with per_host=1, however many requests go over it
+        self.assertEqual(len({address for _, _, address in self.server.requests}), 1)
+
+    def test_throttled_site_is_retried(self):
+        results = self.check({"Throttle": self.site("throttle")}, usernames=["alice"])
+        self.assertEqual(results["alice"]["Throttle"]["status"], "Claimed")
+        self.assertNotIn("error", results["alice"]["Throttle"])
+        self.assertEqual(self.server.hits["/throttle/alice"], 2)
+        self.assertEqual(osint.rate_limiter("presence_host:127.0.0.1").throttles, 1)
+
+    def test_site_that_stays_throttled_is_an_error(self):
+        results = self.check({"Limited": self.site("limited")}, usernames=["alice"])
+        self.assertEqual(results["alice"]["Limited"]["status"], "Unknown")
+        self.assertEqual(results["alice"]["Limited"]["error"], "Rate limited")
+        self.assertEqual(self.server.hits["/limited/alice"], osint.PresenceChecker.THROTTLE_ATTEMPTS)
+
+    def test_unreachable_site_is_an_error(self):
+        with closed_port() as port:
+            results = self.check({"Down": {"url": f"http://127.0.0.1:{port}/{{}}"}}, usernames=["alice"])
+        self.assertEqual(results["alice"]["Down"]["status"], "Unknown")
+        self.assertIn("error", results["alice"]["Down"])
+
+    def test_presence_check_fails_when_most_sites_error(self):
+        with tempfile.TemporaryDirectory() as output_dir, closed_port() as port:
+            sites_file = Path(output_dir) / "data.json"
+            sites = {"Status": self.site("status"), "Limited": self.site("limited"),
+                     "Down": {"url": f"http://127.0.0.1:{port}/{{}}"}}
+            sites_file.write_text(json.dumps(sites))
+            self.assertFalse(osint.run_presence_check("alice", output_dir, sites_file))
+
+            sites_file.write_text(json.dumps({"Status": self.site("status"), "Limited": self.site("limited")}))
+            self.assertTrue(osint.run_presence_check("alice", output_dir, sites_file))
+            with open(Path(output_dir) / "alice_sherlock.json") as f:
+                self.assertEqual(json.load(f)["Status"]["status"], "Claimed")
+
+if __name__ == "__main__":
+    unittest.main()